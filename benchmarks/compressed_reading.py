@@ -0,0 +1,76 @@
+"""
+Compara a leitura de um CSV comprimido: pd.read_csv com a descompressão padrão
+do pandas x utils.readers (gzip em thread própria com o python-isal, quando
+instalado), na leitura inteira e em blocos.
+
+Uso:
+    python benchmarks/compressed_reading.py [--rows 1000000] [--chunksize 100000]
+"""
+
+import argparse
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.readers import iter_file_chunks, read_data  # noqa: E402
+from utils.synthetic import write_synthetic  # noqa: E402
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "superstore.csv")
+        write_synthetic(csv_path, "superstore", args.rows, seed=42)
+
+        codecs = {"gzip": ".gz"}
+        try:
+            import zstandard  # noqa: F401
+
+            codecs["zstd"] = ".zst"
+        except ImportError:
+            pass
+
+        for codec, extension in codecs.items():
+            path = csv_path + extension
+            if codec == "gzip":
+                with open(csv_path, "rb") as src, gzip.open(path, "wb", compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst)
+            else:
+                pd.read_csv(csv_path).to_csv(path, index=False, compression=codec)
+
+            expected, t_pandas = timed(lambda: pd.read_csv(path))
+            result, t_ours = timed(lambda: read_data(path)[0])
+            rows, t_chunks = timed(
+                lambda: sum(len(chunk) for chunk in iter_file_chunks(path, args.chunksize))
+            )
+
+            size = os.path.getsize(path) / 2**20
+            print(f"{codec} ({size:,.0f} MiB, {len(expected):,} linhas)")
+            print(f"  pd.read_csv:        {t_pandas:8.2f}s")
+            print(
+                f"  read_data:          {t_ours:8.2f}s  ({t_pandas / t_ours:,.1f}x)  "
+                f"idênticos: {expected.equals(result)}"
+            )
+            print(f"  em blocos:          {t_chunks:8.2f}s  ({rows:,} linhas)")
+
+
+if __name__ == "__main__":
+    main()
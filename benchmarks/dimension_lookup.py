@@ -0,0 +1,123 @@
+"""
+Compara a busca de atributos de dimensão a partir da fato: merge do pandas em
+chaves texto (customer_id/product_id) x acesso posicional pelo índice denso das
+surrogate keys (utils.lookup), no Star Schema gerado pelo próprio pipeline
+(dados sintéticos do Super Store -> clean_data -> create_star_schema).
+
+Uso:
+    python benchmarks/dimension_lookup.py [--rows 50000 10000000]
+
+A base de 10 milhões de linhas precisa de ~8 GB de RAM no pico (Star Schema
+completo em memória); em máquinas menores, use por exemplo --rows 50000 5000000.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.core import clean_data, create_star_schema  # noqa: E402
+from utils.dedup import RowDeduplicator  # noqa: E402
+from utils.lookup import build_lookup_indexes, denormalize, take_dimension  # noqa: E402
+from utils.schemas import SUPERSTORE_CONTRACT  # noqa: E402
+from utils.synthetic import iter_synthetic  # noqa: E402
+
+# Atributos buscados por chave: (coluna texto da fato, dimensão, atributos)
+ATTRIBUTES = {
+    "customer_key": ("customer_id", "dim_cliente", ["segment"]),
+    "product_key": ("product_id", "dim_produto", ["category"]),
+}
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def build_schema(rows, seed):
+    """
+    Mesmos dados de generate_frame, gerados e limpos bloco a bloco (deduplicação
+    entre blocos, como na CLI): a base bruta inteira não precisa caber na memória.
+    """
+    started = time.perf_counter()
+    deduplicator = RowDeduplicator()
+    df_clean = pd.concat(
+        [
+            clean_data(table.to_pandas(), contract=SUPERSTORE_CONTRACT, deduplicator=deduplicator)
+            for table in iter_synthetic("superstore", rows, seed=seed)
+        ],
+        ignore_index=True,
+    )
+    schema = create_star_schema(df_clean)
+    del df_clean
+    print(f"linhas={rows:>12,}  Star Schema gerado em {time.perf_counter() - started:.1f}s "
+          f"(fato: {len(schema['fato_vendas']):,} linhas)")
+    return schema
+
+
+def run(rows, seed):
+    schema = build_schema(rows, seed)
+    fato = schema["fato_vendas"]
+    lookups = build_lookup_indexes(schema)
+
+    def merge_attributes(out):
+        for id_col, dim_name, columns in ATTRIBUTES.values():
+            out = out.merge(schema[dim_name][[id_col, *columns]], on=id_col, how="left")
+        return out
+
+    def by_merge():
+        return merge_attributes(fato[[id_col for id_col, _, _ in ATTRIBUTES.values()]])
+
+    def by_take():
+        return pd.concat(
+            [
+                take_dimension(schema[dim_name], fact_key, fato[fact_key], columns, lookups[fact_key])
+                for fact_key, (_, dim_name, columns) in ATTRIBUTES.items()
+            ],
+            axis=1,
+        )
+
+    # Fato completa desnormalizada
+    def by_merge_full():
+        return merge_attributes(fato)
+
+    def by_denormalize():
+        wanted = {fact_key: columns for fact_key, (_, _, columns) in ATTRIBUTES.items()}
+        return denormalize(schema, wanted, lookups=lookups)
+
+    attrs = [col for _, _, columns in ATTRIBUTES.values() for col in columns]
+    merged, taken = by_merge(), by_take()
+    same = all((merged[col].to_numpy() == taken[col].to_numpy()).all() for col in attrs)
+    merged, taken = by_merge_full(), by_denormalize()
+    same_full = all((merged[col].to_numpy() == taken[col].to_numpy()).all() for col in attrs)
+    del merged, taken
+
+    for label, t_merge, t_take in [
+        ("atributos", timed(by_merge), timed(by_take)),
+        ("fato completa", timed(by_merge_full), timed(by_denormalize)),
+    ]:
+        print(f"  {label:<14} merge texto: {t_merge:8.3f}s  take posicional: {t_take:8.3f}s  "
+              f"({t_merge / t_take:,.1f}x)")
+    print(f"  idênticos: {same and same_full}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 10_000_000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        run(rows, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compara os backends do core (pandas x DuckDB) na limpeza + Star Schema do
+Super Store, lendo o mesmo CSV sintético, e confere se os resultados são iguais.
+
+Uso:
+    python benchmarks/engines.py [--rows 100000 1000000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.core import clean_data, create_star_schema  # noqa: E402
+from utils.duckdb_engine import star_schema_from_source_duckdb  # noqa: E402
+from utils.readers import read_data  # noqa: E402
+from utils.schemas import SUPERSTORE_CONTRACT  # noqa: E402
+from utils.synthetic import write_synthetic  # noqa: E402
+
+
+def run_pandas(path):
+    df_raw, _ = read_data(path, SUPERSTORE_CONTRACT)
+    df_clean = clean_data(df_raw, contract=SUPERSTORE_CONTRACT)
+    return create_star_schema(df_clean)
+
+
+def run_duckdb(path):
+    # Mesmo caminho da CLI: limpeza e Star Schema sem passar os dados limpos pelo pandas
+    schema, _, _ = star_schema_from_source_duckdb(path, SUPERSTORE_CONTRACT)
+    return schema
+
+
+def same_schema(left, right):
+    for name, table in left.items():
+        other = right[name][table.columns]
+        try:
+            pd.testing.assert_frame_equal(
+                table.reset_index(drop=True),
+                other.reset_index(drop=True),
+                check_dtype=False,
+            )
+        except AssertionError as e:
+            print(f"  {name} difere: {str(e).splitlines()[0]}")
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"superstore_{rows}.csv")
+            write_synthetic(path, "superstore", rows, seed=42)
+
+            started = time.perf_counter()
+            by_pandas = run_pandas(path)
+            t_pandas = time.perf_counter() - started
+
+            started = time.perf_counter()
+            by_duckdb = run_duckdb(path)
+            t_duckdb = time.perf_counter() - started
+
+            print(
+                f"linhas={rows:>12,}  pandas: {t_pandas:8.2f}s  duckdb: {t_duckdb:8.2f}s  "
+                f"({t_pandas / t_duckdb:,.1f}x)  idênticos: {same_schema(by_pandas, by_duckdb)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compara a leitura de uma planilha .xlsx grande: pd.read_excel (openpyxl padrão)
+x leitor em streaming de utils.excel (calamine, quando instalado, e openpyxl
+em modo read_only), e confere se os valores lidos são iguais.
+
+Uso:
+    python benchmarks/excel_reading.py [--rows 100000]
+"""
+
+import argparse
+import builtins
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.excel import read_excel  # noqa: E402
+from utils.synthetic import generate_frame  # noqa: E402
+
+
+@contextmanager
+def without_calamine():
+    """Simula o ambiente sem python-calamine (força o openpyxl read_only)."""
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name == "python_calamine":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    builtins.__import__ = fake_import
+    try:
+        yield
+    finally:
+        builtins.__import__ = real_import
+
+
+def measure(fn):
+    started = time.perf_counter()
+    df = fn()
+    return df, time.perf_counter() - started
+
+
+def same_values(left, right):
+    right = right.astype(left.dtypes.to_dict())
+    return left.equals(right)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "superstore.xlsx")
+        df = generate_frame("superstore", args.rows, seed=42)
+        df.to_excel(path, index=False)
+
+        expected, t_pandas = measure(lambda: pd.read_excel(path))
+        print(f"linhas={len(expected):,}")
+        print(f"  pd.read_excel:      {t_pandas:8.2f}s")
+
+        runs = [("openpyxl read_only", without_calamine)]
+        try:
+            import python_calamine  # noqa: F401
+
+            runs.insert(0, ("calamine", None))
+        except ImportError:
+            print("  calamine:           não instalado (pip install python-calamine)")
+
+        for label, context in runs:
+            if context is None:
+                result, elapsed = measure(lambda: read_excel(path))
+            else:
+                with context():
+                    result, elapsed = measure(lambda: read_excel(path))
+            print(
+                f"  {label + ':':<19} {elapsed:8.2f}s  "
+                f"({t_pandas / elapsed:,.1f}x)  idênticos: {same_values(expected, result)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
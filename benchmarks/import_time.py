@@ -0,0 +1,89 @@
+"""
+Mede o tempo de importação (cold start) dos módulos do app com `python -X importtime`.
+
+Uso:
+    python benchmarks/import_time.py [--runs 5]
+
+Cada módulo é importado em um processo novo; reporta a mediana do tempo cumulativo
+e falha (exit code 1) se algum módulo passar da meta ou carregar dependências proibidas.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Metas em milissegundos (tempo cumulativo do módulo, mediana).
+# Baseline antes da divisão de módulos: utils.core ~770 ms, dos quais ~70 ms eram
+# bs4 + urllib.request carregados mesmo sem scraping. pandas (~690 ms) é inevitável
+# para o core; a meta é que nada além dele pese no import.
+TARGETS_MS = {
+    "utils.paths": 50,
+    "utils.jobs": 80,
+    "utils.db": 900,
+    "utils.core": 900,
+    "utils.scraping": 900,
+}
+
+# Dependências que não podem ser carregadas no import de cada módulo
+FORBIDDEN = {
+    "utils.core": ("bs4", "urllib.request"),
+    "utils.scraping": ("bs4", "urllib.request"),
+    "utils.jobs": ("pandas",),
+}
+
+
+def measure(module):
+    """Retorna (tempo cumulativo em ms, conjunto de módulos importados)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total_us = None
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        imported.add(name)
+        if name == module:
+            total_us = int(cumulative)
+
+    return total_us / 1000, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for module, target in TARGETS_MS.items():
+        timings = []
+        imported = set()
+        for _ in range(args.runs):
+            elapsed, imported = measure(module)
+            timings.append(elapsed)
+
+        median = statistics.median(timings)
+        leaked = [dep for dep in FORBIDDEN.get(module, ()) if dep in imported]
+        ok = median <= target and not leaked
+        failed |= not ok
+
+        status = "OK " if ok else "FAIL"
+        extra = f" (carregou: {', '.join(leaked)})" if leaked else ""
+        print(f"[{status}] {module:<16} {median:8.1f} ms  (meta {target} ms){extra}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Mede a escalabilidade da limpeza em blocos paralelos (utils.parallel) contra o
+clean_data sequencial, no mesmo DataFrame sintético do Super Store, e confere
+se os resultados são iguais.
+
+Uso:
+    python benchmarks/parallel_clean.py [--rows 2000000] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.core import clean_data  # noqa: E402
+from utils.parallel import clean_data_parallel  # noqa: E402
+from utils.readers import read_data  # noqa: E402
+from utils.schemas import SUPERSTORE_CONTRACT  # noqa: E402
+from utils.synthetic import write_synthetic  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "superstore.csv")
+        write_synthetic(path, "superstore", args.rows, seed=42)
+        df_raw, _ = read_data(path, SUPERSTORE_CONTRACT)
+
+    print(f"linhas={len(df_raw):,}  núcleos={os.cpu_count()}")
+
+    started = time.perf_counter()
+    expected = clean_data(df_raw.copy(), contract=SUPERSTORE_CONTRACT)
+    t_seq = time.perf_counter() - started
+    print(f"  sequencial: {t_seq:8.2f}s")
+
+    for workers in args.workers:
+        started = time.perf_counter()
+        result = clean_data_parallel(
+            df_raw.copy(), workers=workers, contract=SUPERSTORE_CONTRACT
+        )
+        elapsed = time.perf_counter() - started
+        try:
+            pd.testing.assert_frame_equal(expected, result)
+            same = True
+        except AssertionError:
+            same = False
+        print(
+            f"  workers={workers:>3}: {elapsed:8.2f}s  ({t_seq / elapsed:,.1f}x)  "
+            f"idênticos: {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Mede a vazão do gerador de dados sintéticos (utils.synthetic) por schema e
+formato de saída, em milhões de linhas por minuto.
+
+Uso:
+    python benchmarks/synthetic_generation.py [--rows 5000000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.synthetic import write_synthetic  # noqa: E402
+
+OUTPUTS = [".csv", ".parquet", ".csv.gz", ".csv.zst"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for schema in ("superstore", "food"):
+            print(f"{schema} ({args.rows:,} linhas)")
+            for extension in OUTPUTS:
+                path = os.path.join(tmp, f"{schema}{extension}")
+                started = time.perf_counter()
+                try:
+                    rows = write_synthetic(path, schema, args.rows, seed=42)
+                except ImportError as e:
+                    print(f"  {extension:<10} indisponível: {e}")
+                    continue
+                elapsed = time.perf_counter() - started
+                size = os.path.getsize(path) / 2**20
+                print(
+                    f"  {extension:<10} {elapsed:8.2f}s  {rows / elapsed * 60 / 1e6:6.1f} M linhas/min  "
+                    f"{size:8,.0f} MiB"
+                )
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
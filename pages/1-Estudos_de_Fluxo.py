@@ -1,11 +1,29 @@
+import os
+
 import streamlit as st
 import pandas as pd
-import sqlite3
 
-from utils.ui import setup_sidebar, add_back_to_top
+from utils.ui import (
+    setup_sidebar,
+    add_back_to_top,
+    paginate_dataframe,
+    pagination_controls,
+    track_job,
+    run_history_expander,
+)
 from utils.load_file import load_data
 from utils.core import run_food_production_etl
+from utils.jobs import submit_job
+from utils.db import (
+    PRODUCAO_COLUMNS,
+    table_exists,
+    query_producao_page,
+    producao_summary,
+    quarantine_summary,
+)
 from utils.paths import DATA_DIR
+from utils.runs import RunLedger, run_tracked
+from utils.schemas import FOOD_PRODUCTION_CONTRACT
 
 st.set_page_config(page_title="Estudos de Fluxo", page_icon="⛓️", layout="wide")
 
@@ -17,6 +35,21 @@ st.title("⛓️ Estudos de Fluxo")
 # --- CONFIGURAÇÃO ---
 DB_FILE = str(DATA_DIR / "estudos_de_fluxos.db")
 CSV_FILE = str(DATA_DIR / "producao_alimentos.csv")
+# Mesmos parâmetros da CLI (food sem --append): as execuções se reconhecem no histórico
+ETL_PARAMS = {"db": os.path.abspath(DB_FILE), "engine": "pandas", "append": False}
+
+ledger = RunLedger()
+
+
+def record_etl_result(result, run):
+    processed_count, rows_dropped = result
+    run.add_output(DB_FILE, kind="sqlite", rows=processed_count)
+    run.finish(
+        rows_in=processed_count + rows_dropped,
+        rows_out=processed_count,
+        rows_rejected=rows_dropped,
+    )
+
 
 # --- INTERFACE ---
 
@@ -38,7 +71,7 @@ with tabs[0]:
     st.subheader("Análise da Qualidade dos Dados (Raw)")
 
     # Carregamento Fixo
-    df_raw, msg = load_data(CSV_FILE)
+    df_raw, msg = load_data(CSV_FILE, contract=FOOD_PRODUCTION_CONTRACT)
 
     if df_raw is not None:
         st.caption(
@@ -53,31 +86,28 @@ with tabs[0]:
         col_qty = "quantidade_produzida_kgs"
         col_rev = "receita_total"
 
-        def highlight_showcase(row):
-            styles = [""] * len(row)
+        def highlight_showcase(df):
+            # Máscaras calculadas por coluna (vetorizado), não linha a linha
+            styles = pd.DataFrame("", index=df.index, columns=df.columns)
 
             # Regra 1: Quantidade <= 10
-            try:
-                if float(row[col_qty]) <= 10:
-                    return ["background-color: #ffcdd2"] * len(row)
-            except Exception:
-                pass
+            qty = pd.to_numeric(df[col_qty], errors="coerce")
+            mask_drop = (qty <= 10).to_numpy()
+            styles.loc[mask_drop, :] = "background-color: #ffcdd2"
 
             # Regra 2: Receita com Ponto
-            try:
-                val_rev = str(row[col_rev])
-                if "." in val_rev:
-                    idx = row.index.get_loc(col_rev)
-                    styles[idx] = (
-                        "color: #e65100; font-weight: bold; background-color: #fff3e0"
-                    )
-            except Exception:
-                pass
+            mask_rev = df[col_rev].astype(str).str.contains(".", regex=False)
+            mask_rev = mask_rev.to_numpy() & ~mask_drop
+            styles.loc[mask_rev, col_rev] = (
+                "color: #e65100; font-weight: bold; background-color: #fff3e0"
+            )
 
             return styles
 
+        # Apenas a janela visível é estilizada e enviada ao navegador
+        df_page = paginate_dataframe(df_raw, key="raw_preview")
         st.dataframe(
-            df_raw.style.apply(highlight_showcase, axis=1),
+            df_page.style.apply(highlight_showcase, axis=None),
             use_container_width=True,
             height=400,
         )
@@ -93,43 +123,126 @@ with tabs[1]:
     st.markdown(
         """
         O pipeline aplica as seguintes transformações:
-        1.  **Filtro**: Ignora linhas com `quantidade <= 10`.
+        1.  **Filtro**: Envia para a quarentena linhas com `quantidade <= 10` ou valores inválidos.
         2.  **Sanatização**: Remove pontos da coluna `receita_total` e converte para Inteiro.
         3.  **Enriquecimento**: Calcula `Margem de Lucro = (Receita / Qtd) - Preço Médio`.
         4.  **Carga**: Salva o resultado limpo no banco SQLite.
         """
     )
 
-    if st.button("Rodar Pipeline de Limpeza", type="primary"):
+    if "etl_job" not in st.session_state:
+        st.session_state.etl_job = None
+    if "etl_result" not in st.session_state:
+        st.session_state.etl_result = None
+    if "etl_reused" not in st.session_state:
+        st.session_state.etl_reused = None
+
+    force = st.toggle(
+        "Forçar reprocessamento",
+        help="Por padrão, uma entrada idêntica já carregada no SQLite não é processada de novo.",
+    )
+    if st.button(
+        "Rodar Pipeline de Limpeza",
+        type="primary",
+        disabled=st.session_state.etl_job is not None,
+    ):
         if df_raw is None:
             st.stop()
 
-        with st.status("Processando dados...", expanded=True) as status:
-            try:
-                # Execução do Pipeline via função Core
-                st.write("🔌 Conectando e Processando...")
-
-                processed_count, rows_dropped = run_food_production_etl(df_raw, DB_FILE)
-
-                status.update(
-                    label="✅ Pipeline Concluído!", state="complete", expanded=True
-                )
-
-                # Métricas de Sucesso
-                c1, c2, c3 = st.columns(3)
-                c1.metric("Registros Processados", processed_count)
-                c2.metric("Registros Removidos (Lixo)", rows_dropped)
-                c3.metric("Qualidade Final", "100%")
-
-                st.success("Dados limpos armazenados com sucesso no SQLite.")
-
-                # 4. Resultado
-                st.markdown("#### Dados Finais)")
-                conn = sqlite3.connect(DB_FILE)
-                df_result = pd.read_sql("SELECT * FROM producao", conn)
-                st.dataframe(df_result, use_container_width=True)
-                conn.close()
+        inputs = [ledger.file_input(CSV_FILE)]
+        done = None if force else ledger.find_completed("food", inputs, ETL_PARAMS)
+        if done:
+            st.session_state.etl_result = (done["rows_out"], done["rows_rejected"])
+            st.session_state.etl_reused = done
+        else:
+            # Execução do Pipeline em segundo plano via função Core, registrada no histórico
+            job = submit_job(
+                "Pipeline de Limpeza",
+                run_tracked,
+                ledger,
+                "food",
+                inputs,
+                run_food_production_etl,
+                df_raw,
+                DB_FILE,
+                params=ETL_PARAMS,
+                summarize=record_etl_result,
+                targets=[DB_FILE],
+            )
+            st.session_state.etl_job = job.id
+            st.session_state.etl_result = None
+            st.session_state.etl_reused = None
+
+    job = track_job("etl_job", "🔌 Conectando e Processando...")
+    if job is not None:
+        if job.status == "done":
+            st.session_state.etl_result = job.result()
+        elif job.status == "cancelled":
+            st.warning("Pipeline cancelado. Nenhum dado foi confirmado no SQLite.")
+        else:
+            st.error(f"Erro na execução: {job.error()}")
+            st.status("❌ Falha no Pipeline", state="error")
+
+    if st.session_state.etl_result is not None:
+        processed_count, rows_dropped = st.session_state.etl_result
+        st.status("✅ Pipeline Concluído!", state="complete")
+
+        # Métricas de Sucesso
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Registros Processados", processed_count)
+        c2.metric("Registros Removidos (Lixo)", rows_dropped)
+        c3.metric("Qualidade Final", "100%")
+
+        reused = st.session_state.etl_reused
+        if reused:
+            st.info(
+                f"Entrada idêntica já processada na execução #{reused['id']} "
+                f"({reused['started_at']}): resultado reaproveitado do SQLite."
+            )
+        else:
+            st.success("Dados limpos armazenados com sucesso no SQLite.")
+
+    run_history_expander(ledger, "food")
+
+    # 4. Resultado (paginação, filtro, ordenação e agregados executados no SQLite)
+    if table_exists(DB_FILE):
+        st.markdown("#### Dados Finais")
+
+        f1, f2, f3, f4 = st.columns(4)
+        produto_filter = f1.text_input("Filtrar produto (prefixo)", key="res_produto")
+        min_quantidade = f2.number_input(
+            "Quantidade mínima", min_value=0, value=0, step=1, key="res_min_qtd"
+        )
+        order_by = f3.selectbox("Ordenar por", PRODUCAO_COLUMNS, key="res_order_by")
+        descending = f4.toggle("Decrescente", key="res_desc")
+
+        min_quantidade = min_quantidade or None
+        summary = producao_summary(DB_FILE, produto_filter, min_quantidade)
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Registros", f"{summary['registros']:,}")
+        m2.metric("Quantidade Total (kg)", f"{summary['quantidade_total']:,}")
+        m3.metric("Receita Total", f"{summary['receita_total']:,}")
+        m4.metric(
+            "Margem Média",
+            f"{summary['margem_media']:.2f}" if summary["margem_media"] is not None else "-",
+        )
 
-            except Exception as e:
-                st.error(f"Erro na execução: {e}")
-                status.update(label="❌ Falha no Pipeline", state="error")
+        offset, limit = pagination_controls(summary["registros"], key="res_page")
+        df_result, _ = query_producao_page(
+            DB_FILE,
+            offset=offset,
+            limit=limit,
+            order_by=order_by,
+            descending=descending,
+            produto_filter=produto_filter,
+            min_quantidade=min_quantidade,
+        )
+        st.dataframe(df_result, use_container_width=True)
+
+        # Linhas rejeitadas, agrupadas por motivo (contagem feita no SQLite)
+        st.markdown("#### Quarentena por Motivo")
+        df_quarantine = quarantine_summary(DB_FILE)
+        if df_quarantine.empty:
+            st.caption("Nenhuma linha em quarentena.")
+        else:
+            st.dataframe(df_quarantine, use_container_width=True, hide_index=True)
\ No newline at end of file
@@ -1,13 +1,19 @@
+import os
+
 import streamlit as st
 
 from utils.paths import DATA_DIR
-from utils.ui import setup_sidebar, add_back_to_top
+from utils.schemas import SUPERSTORE_CONTRACT
+from utils.ui import setup_sidebar, add_back_to_top, track_job, run_history_expander
+from utils.jobs import submit_job
+from utils.quality import quarantine_counts
+from utils.rollups import MEASURES, build_rollups, query_rollup
+from utils.storage import write_fact_parquet, list_fact_partitions, read_fact_parquet
 from utils.load_file import load_data
-from utils.core import (
-    clean_data,
-    extract_multinational_data,
-    create_star_schema,
-)
+from utils.core import clean_data, create_star_schema
+from utils.scraping import extract_multinational_data
+from utils.runs import RunLedger, run_tracked
+from utils.synthetic import write_synthetic
 
 st.set_page_config(page_title="Projeto Super Store", page_icon="🛒", layout="wide")
 
@@ -18,6 +24,40 @@ st.title("🛒 Projeto Super Store: Modern Data Stack na Prática")
 
 CSV_PATH = str(DATA_DIR / "superstore.csv")
 WIKI_URL = "https://en.wikipedia.org/wiki/List_of_supermarket_chains"
+FACT_PARQUET_DIR = str(DATA_DIR / "fato_vendas")
+FACT_COLUMNS = [
+    "row_id",
+    "order_id",
+    "customer_id",
+    "product_id",
+    "date_id",
+    "location_id",
+    "customer_key",
+    "product_key",
+    "shipment_key",
+    "order_priority",
+    "sales",
+    "profit",
+    "quantity",
+    "discount",
+]
+
+ledger = RunLedger()
+
+
+def record_clean(result, run):
+    df_clean, df_quarantine = result
+    run.finish(
+        rows_in=len(df_clean) + len(df_quarantine),
+        rows_out=len(df_clean),
+        rows_rejected=len(df_quarantine),
+    )
+
+
+def record_schema(result, run):
+    rows = len(result.get("fato_vendas", ()))
+    run.finish(rows_in=rows, rows_out=rows)
+
 
 tabs = st.tabs(["Relatório do Projeto", "Demo Interativa"])
 
@@ -142,13 +182,32 @@ with tabs[1]:
         st.session_state.schema = None
     if "df_wiki" not in st.session_state:
         st.session_state.df_wiki = None
+    if "df_quarantine" not in st.session_state:
+        st.session_state.df_quarantine = None
+    if "rollups" not in st.session_state:
+        st.session_state.rollups = None
+    if "clean_job" not in st.session_state:
+        st.session_state.clean_job = None
+    if "schema_job" not in st.session_state:
+        st.session_state.schema_job = None
 
     # --- 2.1 EXTRACT ---
     with subtab_extract:
 
         st.subheader("Fonte A: Vendas Internas (CSV)")
         st.caption("Simulação da extração do ERP (40k+ linhas).")
-        df_raw, msg = load_data(CSV_PATH)
+        if not os.path.exists(CSV_PATH):
+            st.info(
+                "`data/superstore.csv` não está no repositório. Gere uma base sintética "
+                "no mesmo layout (ou use `python -m utils.cli generate superstore ...`)."
+            )
+            if st.button("🧪 Gerar base sintética (50 mil linhas)"):
+                with st.spinner("Gerando dados..."):
+                    write_synthetic(CSV_PATH, "superstore", 50_000, seed=42)
+                load_data.clear()
+                st.rerun()
+
+        df_raw, msg = load_data(CSV_PATH, contract=SUPERSTORE_CONTRACT)
         if df_raw is not None:
             st.session_state.df_raw = df_raw
             st.dataframe(df_raw.head(), use_container_width=True)
@@ -187,13 +246,44 @@ with tabs[1]:
                 language="markdown",
             )
 
-            if st.button("▶️ Rodar Pipeline de Limpeza"):
-                df_clean = clean_data(st.session_state.df_raw.copy())
-                st.session_state.df_clean = df_clean
-                st.success(f"Dados processados! Linhas válidas: {len(df_clean)}")
+            if st.button(
+                "▶️ Rodar Pipeline de Limpeza",
+                disabled=st.session_state.clean_job is not None,
+            ):
+                job = submit_job(
+                    "Limpeza",
+                    run_tracked,
+                    ledger,
+                    "superstore.limpeza",
+                    [ledger.file_input(CSV_PATH)],
+                    clean_data,
+                    st.session_state.df_raw.copy(),
+                    summarize=record_clean,
+                    return_quarantine=True,
+                    contract=SUPERSTORE_CONTRACT,
+                )
+                st.session_state.clean_job = job.id
+
+            job = track_job("clean_job", "Limpando e tipando dados...")
+            if job is not None:
+                if job.status == "done":
+                    df_clean, df_quarantine = job.result()
+                    st.session_state.df_clean = df_clean
+                    st.session_state.df_quarantine = df_quarantine
+                    st.success(f"Dados processados! Linhas válidas: {len(df_clean)}")
+                elif job.status == "cancelled":
+                    st.warning("Limpeza cancelada.")
+                else:
+                    st.error(f"Erro na limpeza: {job.error()}")
 
             if st.session_state.df_clean is not None:
                 st.dataframe(st.session_state.df_clean.head(), use_container_width=True)
+
+            df_quarantine = st.session_state.df_quarantine
+            if df_quarantine is not None and not df_quarantine.empty:
+                with st.expander(f"🚧 Quarentena: {len(df_quarantine):,} linhas rejeitadas"):
+                    st.dataframe(quarantine_counts(df_quarantine), use_container_width=True)
+                    st.dataframe(df_quarantine.head(100), use_container_width=True)
         else:
             st.warning("Aguardando Ingestão dos dados na etapa anterior.")
 
@@ -219,10 +309,33 @@ with tabs[1]:
         )
 
         if st.session_state.df_clean is not None:
-            if col[0].button("🔨 Construir Modelo Dimensional"):
-                schema = create_star_schema(st.session_state.df_clean)
-                st.session_state.schema = schema
-                col[0].success("Tabelas geradas em memória!")
+            if col[0].button(
+                "🔨 Construir Modelo Dimensional",
+                disabled=st.session_state.schema_job is not None,
+            ):
+                job = submit_job(
+                    "Modelagem",
+                    run_tracked,
+                    ledger,
+                    "superstore.modelagem",
+                    [ledger.file_input(CSV_PATH)],
+                    create_star_schema,
+                    st.session_state.df_clean,
+                    summarize=record_schema,
+                )
+                st.session_state.schema_job = job.id
+
+            with col[0]:
+                job = track_job("schema_job", "Construindo Star Schema...")
+            if job is not None:
+                if job.status == "done":
+                    st.session_state.schema = job.result()
+                    st.session_state.rollups = build_rollups(st.session_state.schema)
+                    col[0].success("Tabelas e rollups gerados em memória!")
+                elif job.status == "cancelled":
+                    col[0].warning("Modelagem cancelada.")
+                else:
+                    col[0].error(f"Erro na modelagem: {job.error()}")
         else:
             col[0].warning(
                 "⚠️ Por favor, execute as etapas 1 (Ingestão) e 2 (Tratamento) antes de prosseguir."
@@ -247,3 +360,81 @@ with tabs[1]:
             )
         elif st.session_state.df_clean is not None:
             col[0].info("Execute a modelagem para visualizar os dados.")
+
+        # --- Rollups: respostas do dashboard sem reagregar a fato ---
+        if st.session_state.rollups:
+            st.markdown("#### Agregações Pré-calculadas (Rollups)")
+            st.caption(
+                "Vendas, lucro e quantidade por ano × semana × mercado, por categoria e "
+                "por segmento. As consultas abaixo leem apenas os rollups."
+            )
+
+            cubo = st.session_state.rollups["agg_ano_semana_mercado"]
+            r1, r2 = st.columns(2)
+            sel_year = r1.selectbox("Ano", sorted(cubo["year"].unique()), key="rollup_year")
+            sel_metric = r2.selectbox("Métrica", MEASURES, key="rollup_metric")
+
+            por_semana = query_rollup(
+                st.session_state.rollups,
+                "agg_ano_semana_mercado",
+                group_by=["weeknum", "market"],
+                year=sel_year,
+            )
+            st.line_chart(
+                por_semana.pivot(index="weeknum", columns="market", values=sel_metric)
+            )
+
+            r3, r4 = st.columns(2)
+            r3.dataframe(
+                st.session_state.rollups["agg_categoria"], use_container_width=True
+            )
+            r4.dataframe(
+                st.session_state.rollups["agg_segmento"], use_container_width=True
+            )
+
+        # --- Persistência: Parquet particionado (ano x mercado) ---
+        st.markdown("#### Camada de Armazenamento (Parquet Particionado)")
+        st.caption(
+            "A `fato_vendas` é gravada particionada por ano e mercado, com estatísticas "
+            "por row group. A consulta abaixo lê apenas as partições e colunas selecionadas."
+        )
+
+        if st.session_state.schema and st.button("💾 Gravar fato_vendas em Parquet"):
+            # O modelo em memória vem sempre do CSV de origem: mesma entrada, mesmas partições
+            inputs = [ledger.file_input(CSV_PATH)]
+            done = ledger.find_completed("superstore.parquet", inputs)
+            if done:
+                st.info(
+                    f"Partições já gravadas a partir desta mesma entrada na execução "
+                    f"#{done['id']} ({done['started_at']}): {done['rows_out']:,} linhas."
+                )
+            else:
+                with st.spinner("Gravando partições..."), ledger.start(
+                    "superstore.parquet", inputs, targets=[FACT_PARQUET_DIR]
+                ) as run:
+                    rows = write_fact_parquet(st.session_state.schema, FACT_PARQUET_DIR)
+                    run.add_output(FACT_PARQUET_DIR, kind="parquet", rows=rows)
+                    run.finish(rows_in=rows, rows_out=rows)
+                st.success(f"{rows:,} linhas gravadas em `{FACT_PARQUET_DIR}`.")
+
+        partitions = list_fact_partitions(FACT_PARQUET_DIR)
+        if not partitions.empty:
+            p1, p2, p3 = st.columns(3)
+            sel_years = p1.multiselect("Ano", sorted(partitions["year"].unique()))
+            sel_markets = p2.multiselect("Mercado", sorted(partitions["market"].unique()))
+            sel_columns = p3.multiselect(
+                "Colunas",
+                FACT_COLUMNS,
+                default=["row_id", "date_id", "sales", "profit", "quantity"],
+            )
+
+            df_slice = read_fact_parquet(
+                FACT_PARQUET_DIR,
+                years=sel_years,
+                markets=sel_markets,
+                columns=sel_columns or None,
+            )
+            st.caption(f"{len(df_slice):,} linhas no recorte selecionado.")
+            st.dataframe(df_slice.head(100), use_container_width=True)
+
+        run_history_expander(ledger, "superstore")
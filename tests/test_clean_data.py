@@ -0,0 +1,34 @@
+"""Limpeza do Super Store (backend pandas)."""
+
+import pandas as pd
+
+from utils.core import clean_data
+from utils.readers import read_data
+from utils.schemas import SUPERSTORE_CONTRACT
+from utils.synthetic import write_synthetic
+
+
+def test_clean_data_accepts_duplicate_index_labels(tmp_path):
+    path = tmp_path / "superstore.csv"
+    write_synthetic(path, "superstore", 4_000, seed=2, null_rate=0.02, bad_date_rate=0.02)
+    df_raw, _ = read_data(str(path), SUPERSTORE_CONTRACT)
+
+    # Blocos concatenados, cada um com o próprio índice 0..n-1
+    half = len(df_raw) // 2
+    chunks = pd.concat(
+        [df_raw.iloc[:half].reset_index(drop=True), df_raw.iloc[half:].reset_index(drop=True)]
+    )
+    assert not chunks.index.is_unique
+
+    clean, quarantine = clean_data(chunks, return_quarantine=True, contract=SUPERSTORE_CONTRACT)
+    expected_clean, expected_quarantine = clean_data(
+        df_raw.copy(), return_quarantine=True, contract=SUPERSTORE_CONTRACT
+    )
+
+    assert not quarantine.empty
+    pd.testing.assert_frame_equal(
+        clean.reset_index(drop=True), expected_clean.reset_index(drop=True)
+    )
+    pd.testing.assert_frame_equal(
+        quarantine.reset_index(drop=True), expected_quarantine.reset_index(drop=True)
+    )
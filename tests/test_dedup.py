@@ -0,0 +1,83 @@
+"""Deduplicação entre blocos e entre cargas (RowDeduplicator)."""
+
+import numpy as np
+import pandas as pd
+
+from utils.dedup import RowDeduplicator, _SortedRuns, row_fingerprints
+
+
+def _frame(ids):
+    return pd.DataFrame({"id": ids, "valor": [f"v{i}" for i in ids]})
+
+
+def test_filter_drops_rows_seen_in_chunk_and_earlier_chunks():
+    dedup = RowDeduplicator()
+
+    first = dedup.filter(_frame([1, 2, 2, 3]))
+    second = dedup.filter(_frame([3, 4, 1, 5]))
+
+    assert first["id"].tolist() == [1, 2, 3]
+    assert second["id"].tolist() == [4, 5]
+    assert len(dedup) == 5
+
+
+def test_saved_loads_are_dropped_and_rolled_back_loads_are_not(tmp_path):
+    state = str(tmp_path / "dedup" / "seen.npy")
+
+    dedup = RowDeduplicator(state_path=state)
+    dedup.filter(_frame([1, 2, 3]))
+    dedup.commit()
+    # Carga seguinte falha: as chaves dela não entram no estado salvo
+    dedup.filter(_frame([4, 5]))
+    dedup.rollback()
+    # Chaves pendentes (carga ainda não confirmada) também não são salvas
+    dedup.filter(_frame([6]))
+    dedup.save()
+
+    reloaded = RowDeduplicator(state_path=state)
+    assert len(reloaded) == 3
+    out = reloaded.filter(_frame([1, 4, 2, 5, 6, 3, 7]))
+    assert out["id"].tolist() == [4, 5, 6, 7]
+
+
+def test_subset_compares_only_key_columns():
+    dedup = RowDeduplicator(subset=["id"])
+    dedup.filter(_frame([1, 2]))
+    dedup.commit()
+
+    changed = _frame([2, 3]).assign(valor="outro")
+    assert dedup.filter(changed)["id"].tolist() == [3]
+
+
+def test_sorted_runs_merge_and_lookup():
+    rng = np.random.default_rng(0)
+    keys = np.unique(rng.integers(0, 2**63, 20_000, dtype=np.uint64))
+    rng.shuffle(keys)
+
+    runs = _SortedRuns()
+    start = 0
+    for size in [1, 5, 300, 2, 4_000, 70, 9_000, 0, 600]:
+        runs.add(np.sort(keys[start : start + size]))
+        start += size
+        # Blocos em tamanhos decrescentes (com folga de 2x), logo O(log n) blocos
+        sizes = [run.size for run in runs.runs]
+        assert all(a > 2 * b for a, b in zip(sizes, sizes[1:]))
+
+    inserted = keys[:start]
+    assert runs.size == start
+    np.testing.assert_array_equal(runs.to_array(), np.sort(inserted))
+
+    probe = np.concatenate([keys[: start // 2], keys[start:]])
+    np.testing.assert_array_equal(runs.contains(probe), np.isin(probe, inserted))
+    assert not _SortedRuns().contains(probe).any()
+
+    # Estado salvo fora de ordem é reordenado ao carregar
+    reloaded = _SortedRuns(inserted)
+    np.testing.assert_array_equal(reloaded.contains(probe), np.isin(probe, inserted))
+
+
+def test_fingerprints_ignore_index():
+    df = _frame([1, 2])
+    np.testing.assert_array_equal(
+        row_fingerprints(df), row_fingerprints(df.set_axis([10, 20]))
+    )
@@ -0,0 +1,56 @@
+"""Carga do pipeline de alimentos no SQLite."""
+
+import sqlite3
+
+import pytest
+
+from utils.core import run_food_production_etl
+from utils.jobs import JobCancelled
+from utils.readers import read_data
+from utils.schemas import FOOD_PRODUCTION_CONTRACT
+from utils.synthetic import write_synthetic
+
+
+def _counts(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return tuple(
+            conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+            for table in ("producao", "producao_quarentena")
+        )
+    finally:
+        conn.close()
+
+
+def test_cancelled_load_keeps_previous_tables(tmp_path):
+    path = tmp_path / "food.csv"
+    write_synthetic(path, "food", 2_000, seed=5)
+    df_raw, _ = read_data(str(path), FOOD_PRODUCTION_CONTRACT)
+    db_path = str(tmp_path / "food.db")
+
+    processed, dropped = run_food_production_etl(df_raw.copy(), db_path, chunksize=500)
+    assert processed > 0 and dropped > 0
+
+    def cancel_on_second_chunk(**info):
+        if info.get("chunk") == 2:
+            raise JobCancelled("cancelado")
+
+    with pytest.raises(JobCancelled):
+        run_food_production_etl(
+            df_raw.copy(), db_path, chunksize=500, progress=cancel_on_second_chunk
+        )
+
+    # DROP/CREATE e INSERTs da carga cancelada são desfeitos juntos
+    assert _counts(db_path) == (processed, dropped)
+
+
+def test_path_source_matches_dataframe(tmp_path):
+    path = tmp_path / "food.csv.gz"
+    write_synthetic(path, "food", 3_000, seed=9)
+    df_raw, _ = read_data(str(path), FOOD_PRODUCTION_CONTRACT)
+
+    from_frame = run_food_production_etl(df_raw, str(tmp_path / "frame.db"), chunksize=700)
+    from_path = run_food_production_etl(path, str(tmp_path / "path.db"), chunksize=700)
+
+    assert from_path == from_frame
+    assert _counts(str(tmp_path / "path.db")) == _counts(str(tmp_path / "frame.db"))
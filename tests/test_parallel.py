@@ -0,0 +1,33 @@
+"""A limpeza em blocos paralelos deve produzir o mesmo resultado (e os mesmos tipos) da sequencial."""
+
+import pandas as pd
+import pytest
+
+from utils import parallel
+from utils.core import clean_data
+from utils.readers import read_data
+from utils.schemas import SUPERSTORE_CONTRACT
+from utils.synthetic import write_synthetic
+
+pytest.importorskip("pyarrow")
+
+
+def test_clean_data_parallel_matches_serial(tmp_path, monkeypatch):
+    path = tmp_path / "superstore.csv"
+    write_synthetic(
+        path, "superstore", 6_000, seed=3, null_rate=0.02, bad_date_rate=0.02, duplicate_rate=0.03
+    )
+    df_raw, _ = read_data(str(path), SUPERSTORE_CONTRACT)
+
+    # Força a divisão em blocos mesmo com poucas linhas
+    monkeypatch.setattr(parallel, "MIN_SHARD_ROWS", 1_000)
+    par_clean, par_quarantine = parallel.clean_data_parallel(
+        df_raw.copy(), workers=3, return_quarantine=True, contract=SUPERSTORE_CONTRACT
+    )
+    clean, quarantine = clean_data(
+        df_raw.copy(), return_quarantine=True, contract=SUPERSTORE_CONTRACT
+    )
+
+    assert not quarantine.empty
+    pd.testing.assert_frame_equal(par_clean, clean)
+    pd.testing.assert_frame_equal(par_quarantine, quarantine)
@@ -0,0 +1,35 @@
+"""Leitura de CSV em blocos: os fallbacks retomam a leitura sem repetir linhas."""
+
+import pandas as pd
+import pytest
+
+from utils.readers import iter_csv_chunks
+from utils.schemas import FOOD_PRODUCTION_CONTRACT
+
+HEADER = "produto,quantidade_produzida_kgs,valor_venda_medio,receita_total"
+
+
+def _write(path, rows, encoding="utf-8"):
+    path.write_bytes("\n".join([HEADER, *rows]).encode(encoding))
+    return str(path)
+
+
+@pytest.mark.parametrize("contract", [None, FOOD_PRODUCTION_CONTRACT])
+def test_encoding_fallback_does_not_repeat_chunks(tmp_path, contract):
+    rows = [f"p{i},{100 + i},2.5,{1000 + i}" for i in range(10)] + ["feijão,150,3.0,2000"]
+    path = _write(tmp_path / "latin.csv", rows, encoding="latin-1")
+
+    df = pd.concat(iter_csv_chunks(path, 4, contract))
+
+    assert len(df) == 11
+    assert df["produto"].tolist() == [f"p{i}" for i in range(10)] + ["feijão"]
+
+
+def test_dtype_fallback_does_not_repeat_chunks(tmp_path):
+    rows = [f"p{i},{100 + i},2.5,{1000 + i}" for i in range(10)] + ["p10,abc,3.0,2000"]
+    path = _write(tmp_path / "bad.csv", rows)
+
+    df = pd.concat(iter_csv_chunks(path, 4, FOOD_PRODUCTION_CONTRACT))
+
+    assert len(df) == 11
+    assert df["quantidade_produzida_kgs"].isna().tolist() == [False] * 10 + [True]
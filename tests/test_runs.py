@@ -0,0 +1,58 @@
+"""Reaproveitamento de execuções pelo ledger (find_completed)."""
+
+from functools import partial
+
+import pytest
+
+from utils.jobs import JobCancelled
+from utils.runs import RunLedger, run_tracked
+
+INPUTS = [{"source": "entrada.csv", "size": 1, "mtime_ns": None, "fingerprint": "abc"}]
+
+
+def _load(db_path, fail=False, progress=None):
+    if fail:
+        raise JobCancelled("cancelado")
+    return 10
+
+
+def _record(result, run, db_path, mode="replace"):
+    run.add_output(db_path, kind="sqlite", rows=result, mode=mode)
+    run.finish(rows_in=result, rows_out=result)
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return RunLedger(tmp_path / "runs.db")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "saida.db"
+    path.touch()
+    return str(path)
+
+
+def test_interrupted_run_invalidates_previous_output(ledger, db_path):
+    summarize = partial(_record, db_path=db_path)
+    run_tracked(ledger, "food", INPUTS, _load, db_path, summarize=summarize, targets=[db_path])
+    first = ledger.find_completed("food", INPUTS)
+    assert first is not None
+
+    # Outra entrada, cancelada no meio da escrita do mesmo destino
+    other = [{**INPUTS[0], "fingerprint": "def"}]
+    with pytest.raises(JobCancelled):
+        run_tracked(
+            ledger, "food", other, _load, db_path, fail=True, summarize=summarize, targets=[db_path]
+        )
+
+    assert ledger.find_completed("food", INPUTS) is None
+
+
+def test_successful_appends_do_not_invalidate_each_other(ledger, db_path):
+    for fingerprint in ("abc", "def"):
+        inputs = [{**INPUTS[0], "fingerprint": fingerprint}]
+        with ledger.start("food", inputs, targets=[db_path]) as run:
+            _record(_load(db_path), run, db_path, mode="append")
+
+    assert ledger.find_completed("food", INPUTS) is not None
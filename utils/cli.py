@@ -0,0 +1,630 @@
+"""
+Execução headless (sem Streamlit) dos pipelines, para uso em cron/batch.
+
+Exemplos:
+    python -m utils.cli food data/producao_alimentos.csv --db data/estudos_de_fluxos.db
+    python -m utils.cli superstore data/drops/ --output out/ --format parquet --workers 4
+    python -m utils.cli superstore data/big.csv --output out/ --engine duckdb
+    python -m utils.cli superstore data/big.csv --output out/ --workers 1 --shard-workers 8
+    python -m utils.cli scrape --output out/dim_company.csv
+    python -m utils.cli history --pipeline superstore
+    python -m utils.cli generate superstore data/superstore.csv --rows 10000000
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from utils.paths import DATA_DIR
+from utils.runs import RUN_HISTORY_DB
+
+WIKI_URL = "https://en.wikipedia.org/wiki/List_of_supermarket_chains"
+CUMULATIVE_ROLLUPS_DIR = "rollups_acumulados"
+
+
+def _print_stats(label, rows, elapsed):
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"{label}: {rows:,} linhas em {elapsed:.2f}s ({rate:,.0f} linhas/s)")
+
+
+def _cache_key(file_path):
+    stat = os.stat(file_path)
+    raw = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _open_ledger(args):
+    if not args.ledger:
+        return None
+    from utils.runs import RunLedger
+
+    return RunLedger(args.ledger)
+
+
+def _skip_message(label, done):
+    return f"{label}: já processado na execução #{done['id']} ({done['started_at']}), pulando (use --force)"
+
+
+def _duckdb_readable(file_path):
+    """Parquet e CSV (puro, .gz ou .zst) são lidos direto pelo DuckDB."""
+    from utils.compression import compression_of, strip_compression
+    from utils.readers import CSV_EXTENSIONS
+
+    name = file_path.lower()
+    if name.endswith(".parquet"):
+        return True
+    return compression_of(name) in (None, "gzip", "zstd") and strip_compression(
+        name
+    ).endswith(CSV_EXTENSIONS)
+
+
+def _load_food_files(unit, args, if_exists, run=None):
+    """
+    Carrega os arquivos de uma unidade na tabela producao em uma única chamada do
+    ETL: uma conexão e uma transação para todos os blocos, índices criados no fim.
+    """
+    from utils.core import run_food_production_etl
+    from utils.readers import iter_file_chunks
+    from utils.schemas import FOOD_PRODUCTION_CONTRACT
+
+    # Linhas lidas até o momento, informadas pelo progresso da carga
+    loaded = {"rows": 0}
+
+    def progress(**info):
+        loaded["rows"] = info.get("rows", loaded["rows"])
+        if run:
+            run.progress(**info)
+
+    def sources():
+        for file_path in unit:
+            file_started = time.perf_counter()
+            rows_before = loaded["rows"]
+
+            if args.engine == "duckdb" and _duckdb_readable(file_path):
+                # O DuckDB lê o arquivo direto, em uma única passada
+                yield file_path
+            else:
+                file_rows = 0
+                for chunk in iter_file_chunks(
+                    file_path, args.chunksize, contract=FOOD_PRODUCTION_CONTRACT
+                ):
+                    file_rows += len(chunk)
+                    if run:
+                        run.stage("leitura", rows=rows_before + file_rows)
+                    yield chunk
+
+            _print_stats(file_path, loaded["rows"] - rows_before, time.perf_counter() - file_started)
+
+    processed, dropped = run_food_production_etl(
+        sources(),
+        args.db,
+        chunksize=args.chunksize,
+        progress=progress,
+        if_exists=if_exists,
+        engine=args.engine,
+    )
+    return loaded["rows"], processed, dropped
+
+
+def run_food(args):
+    from utils.readers import list_input_files
+
+    files = list_input_files(args.inputs)
+    if not files:
+        print("Nenhum arquivo de entrada encontrado.", file=sys.stderr)
+        return 1
+
+    ledger = _open_ledger(args)
+    params = {"db": os.path.abspath(args.db), "engine": args.engine, "append": args.append}
+    # Sem --append a tabela é recriada: todos os arquivos formam uma única carga.
+    # Com --append, cada arquivo é uma carga e os já acrescentados são pulados.
+    units = [[f] for f in files] if args.append else [files]
+
+    total_rows = total_processed = total_dropped = 0
+    started = time.perf_counter()
+    if_exists = "append" if args.append else "replace"
+
+    for unit in units:
+        if ledger is None:
+            rows, processed, dropped = _load_food_files(unit, args, if_exists)
+        else:
+            inputs = [ledger.file_input(f) for f in unit]
+            done = None if args.force else ledger.find_completed("food", inputs, params)
+            if done:
+                print(_skip_message(", ".join(unit), done))
+                continue
+            with ledger.start("food", inputs, params, targets=[args.db]) as run:
+                rows, processed, dropped = _load_food_files(unit, args, if_exists, run)
+                run.add_output(args.db, kind="sqlite", rows=processed, mode=if_exists)
+                run.finish(rows_in=rows, rows_out=processed, rows_rejected=dropped)
+
+        total_rows += rows
+        total_processed += processed
+        total_dropped += dropped
+
+    _print_stats("Total", total_rows, time.perf_counter() - started)
+    print(f"Processados: {total_processed:,} | Removidos: {total_dropped:,} -> {args.db}")
+    return 0
+
+
+def _write_tables(tables, output_dir, fmt):
+    os.makedirs(output_dir, exist_ok=True)
+
+    if fmt == "sqlite":
+        import sqlite3
+
+        conn = sqlite3.connect(os.path.join(output_dir, "star_schema.db"))
+        try:
+            for name, table in tables.items():
+                table.to_sql(name, conn, if_exists="replace", index=False)
+        finally:
+            conn.close()
+        return
+
+    for name, table in tables.items():
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        if fmt == "parquet":
+            table.to_parquet(path, index=False)
+        else:
+            table.to_csv(path, index=False)
+
+
+def _read_tables(names, input_dir, fmt):
+    """Lê as tabelas gravadas por _write_tables (as ausentes ficam de fora)."""
+    import pandas as pd
+
+    if fmt == "sqlite":
+        import sqlite3
+
+        db_path = os.path.join(input_dir, "star_schema.db")
+        if not os.path.exists(db_path):
+            return {}
+        conn = sqlite3.connect(db_path)
+        try:
+            existing = {
+                row[0]
+                for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            }
+            return {
+                name: pd.read_sql_query(f'SELECT * FROM "{name}"', conn)
+                for name in names
+                if name in existing
+            }
+        finally:
+            conn.close()
+
+    tables = {}
+    for name in names:
+        path = os.path.join(input_dir, f"{name}.{fmt}")
+        if os.path.exists(path):
+            tables[name] = pd.read_parquet(path) if fmt == "parquet" else pd.read_csv(path)
+    return tables
+
+
+def _clean_superstore_file(file_path, cache_dir, deduplicator, engine, shard_workers, progress):
+    """Lê e limpa um arquivo (ou reaproveita o cache). Retorna (df_clean, rows_in, cached)."""
+    import pandas as pd
+
+    from utils.core import clean_data
+    from utils.readers import read_data
+    from utils.schemas import SUPERSTORE_CONTRACT
+
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, f"{_cache_key(file_path)}.pkl")
+
+    if cache_path and os.path.exists(cache_path):
+        df_clean = pd.read_pickle(cache_path)
+        if progress:
+            progress(stage="cache", rows=len(df_clean))
+        return df_clean, len(df_clean), True
+
+    df_raw, msg = read_data(file_path, SUPERSTORE_CONTRACT)
+    if df_raw is None:
+        raise RuntimeError(f"{file_path}: {msg}")
+    if progress:
+        progress(stage="leitura", rows=len(df_raw))
+
+    if engine == "pandas" and shard_workers > 1:
+        from utils.parallel import clean_data_parallel
+
+        df_clean = clean_data_parallel(
+            df_raw,
+            workers=shard_workers,
+            progress=progress,
+            contract=SUPERSTORE_CONTRACT,
+            deduplicator=deduplicator,
+        )
+    else:
+        df_clean = clean_data(
+            df_raw,
+            progress=progress,
+            contract=SUPERSTORE_CONTRACT,
+            deduplicator=deduplicator,
+            engine=engine,
+        )
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        df_clean.to_pickle(cache_path)
+    return df_clean, len(df_raw), False
+
+
+def _process_superstore_file(
+    file_path,
+    output_dir,
+    fmt,
+    cache_dir,
+    deduplicator=None,
+    engine="pandas",
+    shard_workers=1,
+    ledger_path=None,
+    params=None,
+    force=False,
+):
+    """
+    Limpa e modela um arquivo (executado em um processo do pool ou em sequência).
+    Com `ledger_path`, registra a execução e pula arquivos idênticos já processados.
+    Com `deduplicator` (cargas incrementais), as linhas novas também são somadas
+    aos rollups acumulados em `output_dir/rollups_acumulados`.
+    """
+    from utils.core import create_star_schema
+    from utils.rollups import ROLLUPS, build_rollups, update_rollups
+
+    started = time.perf_counter()
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    target = os.path.join(output_dir, stem)
+
+    run = None
+    if ledger_path:
+        from utils.runs import RunLedger
+
+        ledger = RunLedger(ledger_path)
+        inputs = [ledger.file_input(file_path)]
+        done = None if force else ledger.find_completed("superstore", inputs, params)
+        if done:
+            return file_path, done["rows_in"], done["rows_out"], _skip_message("", done), None
+        run = ledger.start("superstore", inputs, params, targets=[target])
+
+    with run or nullcontext():
+        progress = run.progress if run else None
+        if engine == "duckdb" and _duckdb_readable(file_path):
+            # O DuckDB lê o arquivo direto e os dados limpos não passam pelo pandas
+            from utils.duckdb_engine import star_schema_from_source_duckdb
+            from utils.schemas import SUPERSTORE_CONTRACT
+
+            # rows_in: linhas distintas (após a deduplicação)
+            schema, rows_in, rows_clean = star_schema_from_source_duckdb(
+                file_path, SUPERSTORE_CONTRACT
+            )
+            cached = False
+            if progress:
+                progress(stage="duckdb", rows=rows_clean)
+        else:
+            df_clean, rows_in, cached = _clean_superstore_file(
+                file_path, cache_dir, deduplicator, engine, shard_workers, progress
+            )
+            schema = create_star_schema(df_clean, progress=progress, engine=engine)
+            rows_clean = len(df_clean)
+        rollups = build_rollups(schema)
+        if run:
+            run.stage("rollups")
+        _write_tables({**schema, **rollups}, target, fmt)
+
+        if run:
+            run.stage("escrita")
+            run.add_output(target, kind=fmt, rows=len(schema.get("fato_vendas", ())))
+
+        if deduplicator is not None and not cached:
+            # A deduplicação entre cargas garante que as linhas não se repetem
+            # entre arquivos, então os rollups acumulados só recebem somas novas
+            # (um arquivo vindo do cache já foi somado quando foi carregado)
+            cumulative_dir = os.path.join(output_dir, CUMULATIVE_ROLLUPS_DIR)
+            cumulative = update_rollups(_read_tables(ROLLUPS, cumulative_dir, fmt), schema)
+            _write_tables(cumulative, cumulative_dir, fmt)
+            if run:
+                run.stage("rollups_acumulados")
+                run.add_output(cumulative_dir, kind=fmt, mode="append")
+
+        if run:
+            run.finish(rows_in=rows_in, rows_out=rows_clean, rows_rejected=rows_in - rows_clean)
+
+    origem = " (cache)" if cached else ""
+    return file_path, rows_in, rows_clean, origem, time.perf_counter() - started
+
+
+def _ledger_kwargs(args):
+    if not args.ledger:
+        return {}
+    params = {
+        "output": os.path.abspath(args.output),
+        "format": args.format,
+        "engine": args.engine,
+        "dedup_state": args.dedup_state and os.path.abspath(args.dedup_state),
+        "dedup_keys": args.dedup_keys,
+    }
+    return {"ledger_path": args.ledger, "params": params, "force": args.force}
+
+
+def _superstore_results(files, args):
+    """
+    Processa os arquivos em um pool de processos. Com --dedup-state, a deduplicação
+    depende dos arquivos anteriores, então o processamento é sequencial.
+    """
+    if args.dedup_state:
+        from utils.dedup import RowDeduplicator
+
+        keys = args.dedup_keys.split(",") if args.dedup_keys else None
+        deduplicator = RowDeduplicator(subset=keys, state_path=args.dedup_state)
+        for file_path in files:
+            try:
+                result = _process_superstore_file(
+                    file_path, args.output, args.format, args.cache_dir, deduplicator,
+                    engine=args.engine,
+                    shard_workers=args.shard_workers,
+                    **_ledger_kwargs(args),
+                )
+            except Exception as e:
+                # As chaves do arquivo que falhou não podem marcar linhas como vistas
+                deduplicator.rollback()
+                yield e
+            else:
+                # Só após as tabelas do arquivo estarem gravadas
+                deduplicator.commit()
+                deduplicator.save()
+                yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(
+                _process_superstore_file,
+                f,
+                args.output,
+                args.format,
+                args.cache_dir,
+                engine=args.engine,
+                shard_workers=args.shard_workers,
+                **_ledger_kwargs(args),
+            )
+            for f in files
+        ]
+        for future in futures:
+            try:
+                yield future.result()
+            except Exception as e:
+                yield e
+
+
+def run_superstore(args):
+    from utils.readers import list_input_files
+
+    if args.dedup_state and args.engine == "duckdb":
+        print("--dedup-state não é suportado com --engine duckdb.", file=sys.stderr)
+        return 2
+
+    files = list_input_files(args.inputs)
+    if not files:
+        print("Nenhum arquivo de entrada encontrado.", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    total_rows = 0
+    failures = 0
+
+    for result in _superstore_results(files, args):
+        if isinstance(result, Exception):
+            print(f"Erro: {result}", file=sys.stderr)
+            failures += 1
+            continue
+
+        file_path, rows_in, rows_out, origem, elapsed = result
+        if elapsed is None:
+            print(f"{file_path}{origem}")
+            continue
+        total_rows += rows_in
+        _print_stats(f"{file_path}{origem}", rows_in, elapsed)
+        print(f"  linhas válidas: {rows_out:,}")
+
+    _print_stats("Total", total_rows, time.perf_counter() - started)
+    return 1 if failures else 0
+
+
+def run_scrape(args):
+    from utils.scraping import extract_multinational_data
+
+    started = time.perf_counter()
+    df, msg = extract_multinational_data(args.url)
+    if df is None:
+        print(f"Erro no scraping: {msg}", file=sys.stderr)
+        return 1
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    if args.output.endswith(".parquet"):
+        df.to_parquet(args.output, index=False)
+    else:
+        df.to_csv(args.output, index=False)
+
+    _print_stats(args.url, len(df), time.perf_counter() - started)
+    return 0
+
+
+GENERATOR_OPTIONS = [
+    "customers",
+    "products",
+    "cities",
+    "lines_per_order",
+    "skew",
+    "duplicate_rate",
+    "bad_date_rate",
+    "null_rate",
+    "low_quantity_rate",
+    "dotted_rate",
+    "bad_revenue_rate",
+]
+
+
+def run_generate(args):
+    from utils.synthetic import write_synthetic
+
+    options = {
+        name: getattr(args, name)
+        for name in GENERATOR_OPTIONS
+        if getattr(args, name) is not None
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+
+    started = time.perf_counter()
+    try:
+        rows = write_synthetic(
+            args.output,
+            args.schema,
+            args.rows,
+            seed=args.seed,
+            chunk_rows=args.chunk_rows,
+            **options,
+        )
+    except (TypeError, ValueError) as e:
+        print(f"Erro na geração: {e}", file=sys.stderr)
+        return 2
+
+    _print_stats(args.output, rows, time.perf_counter() - started)
+    return 0
+
+
+def run_history(args):
+    import pandas as pd
+
+    from utils.runs import RunLedger
+
+    ledger = RunLedger(args.ledger)
+    df = ledger.history(args.pipeline, limit=args.limit)
+    if df.empty:
+        print("Nenhuma execução registrada.")
+        return 0
+
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(df.drop(columns="error").to_string(index=False))
+        if args.stages:
+            print(f"\nEtapas da execução #{args.stages}:")
+            print(ledger.stages(args.stages).to_string(index=False))
+    return 0
+
+
+def _add_ledger_arguments(parser):
+    parser.add_argument(
+        "--ledger",
+        default=RUN_HISTORY_DB,
+        help="Histórico de execuções (SQLite); vazio para não registrar",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reprocessa entradas idênticas já registradas no histórico",
+    )
+
+
+def _add_engine_argument(parser):
+    parser.add_argument(
+        "--engine",
+        choices=["pandas", "duckdb"],
+        default="pandas",
+        help="Backend das transformações (duckdb: multi-thread e out-of-core)",
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.cli",
+        description="Execução headless dos pipelines de dados.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    food = sub.add_parser("food", help="Pipeline de produção de alimentos -> SQLite")
+    food.add_argument("inputs", nargs="+", help="Arquivos CSV/Excel ou diretórios")
+    food.add_argument("--db", default=str(DATA_DIR / "estudos_de_fluxos.db"))
+    food.add_argument("--chunksize", type=int, default=100_000)
+    food.add_argument(
+        "--append",
+        action="store_true",
+        help="Acrescenta à tabela producao em vez de recriá-la",
+    )
+    _add_engine_argument(food)
+    _add_ledger_arguments(food)
+    food.set_defaults(func=run_food)
+
+    store = sub.add_parser("superstore", help="Limpeza + Star Schema do Super Store")
+    store.add_argument("inputs", nargs="+", help="Arquivos CSV/Excel ou diretórios")
+    store.add_argument("--output", required=True, help="Diretório de saída")
+    store.add_argument(
+        "--format", choices=["csv", "parquet", "sqlite"], default="parquet"
+    )
+    store.add_argument("--workers", type=int, default=os.cpu_count())
+    store.add_argument(
+        "--shard-workers",
+        type=int,
+        default=1,
+        help="Processos para limpar cada arquivo em blocos de linhas (arquivos grandes)",
+    )
+    store.add_argument(
+        "--cache-dir", help="Reaproveita dados limpos de arquivos já processados"
+    )
+    store.add_argument(
+        "--dedup-state",
+        help="Arquivo .npy com as impressões digitais já vistas (dedup entre cargas)",
+    )
+    store.add_argument(
+        "--dedup-keys",
+        help="Colunas da chave de deduplicação, separadas por vírgula (padrão: linha inteira)",
+    )
+    _add_engine_argument(store)
+    _add_ledger_arguments(store)
+    store.set_defaults(func=run_superstore)
+
+    scrape = sub.add_parser("scrape", help="Scraping das multinacionais (Wikipedia)")
+    scrape.add_argument("--url", default=WIKI_URL)
+    scrape.add_argument("--output", required=True, help="Arquivo .csv ou .parquet")
+    scrape.set_defaults(func=run_scrape)
+
+    gen = sub.add_parser(
+        "generate", help="Gera dados sintéticos (Super Store ou alimentos) em CSV/Parquet"
+    )
+    gen.add_argument("schema", choices=["superstore", "food"])
+    gen.add_argument("output", help="Arquivo .csv, .csv.gz, .csv.zst ou .parquet")
+    gen.add_argument("--rows", type=int, default=1_000_000)
+    gen.add_argument("--seed", type=int, default=42)
+    gen.add_argument("--chunk-rows", type=int, default=1_000_000)
+    for name in ("customers", "products", "cities", "lines-per-order"):
+        gen.add_argument(f"--{name}", type=int, help="Cardinalidade (padrão do gerador)")
+    gen.add_argument("--skew", type=float, help="Expoente da Zipf de clientes/produtos (0 = uniforme)")
+    for name in (
+        "duplicate-rate",
+        "bad-date-rate",
+        "null-rate",
+        "low-quantity-rate",
+        "dotted-rate",
+        "bad-revenue-rate",
+    ):
+        gen.add_argument(f"--{name}", type=float, help="Fração das linhas (0 a 1)")
+    gen.set_defaults(func=run_generate)
+
+    history = sub.add_parser("history", help="Histórico de execuções e throughput")
+    history.add_argument("--pipeline", choices=["food", "superstore"])
+    history.add_argument("--limit", type=int, default=20)
+    history.add_argument("--stages", type=int, help="Mostra os tempos por etapa da execução")
+    history.add_argument("--ledger", default=RUN_HISTORY_DB)
+    history.set_defaults(func=run_history)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
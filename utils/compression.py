@@ -0,0 +1,119 @@
+"""
+Descompressão em streaming das entradas (.gz, .bz2, .xz, .zst, .zip), para
+caminhos e buffers, sem descompactar o arquivo em disco ou na memória.
+
+Para gzip, se o python-isal estiver instalado (pip install isal), a
+descompressão roda em uma thread própria, fora do GIL, em paralelo com o
+parsing do CSV. O zstd requer o pacote zstandard.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+import zipfile
+from contextlib import ExitStack, contextmanager
+
+COMPRESSIONS = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+    ".zip": "zip",
+}
+
+
+def compression_of(filename):
+    """Codec indicado pela extensão do arquivo (ou None se não comprimido)."""
+    return COMPRESSIONS.get(os.path.splitext(str(filename).lower())[1])
+
+
+def strip_compression(filename):
+    """Nome do arquivo sem a extensão de compressão (dados.csv.gz -> dados.csv)."""
+    filename = str(filename)
+    if compression_of(filename):
+        return os.path.splitext(filename)[0]
+    return filename
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def _open_gzip(source):
+    try:
+        from isal import igzip_threaded
+    except ImportError:
+        if isinstance(source, str):
+            return gzip.open(source, "rb")
+        return gzip.GzipFile(fileobj=source, mode="rb")
+    return igzip_threaded.open(source, "rb", threads=1)
+
+
+def _open_zstd(source, stack):
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Arquivos .zst requerem o pacote zstandard (pip install zstandard)")
+
+    raw = stack.enter_context(open(source, "rb")) if isinstance(source, str) else source
+    # closefd=False: o arquivo (ou o buffer de quem chamou) é fechado por fora
+    return zstandard.ZstdDecompressor().stream_reader(
+        raw, read_across_frames=True, closefd=False
+    )
+
+
+def zip_member(archive, extensions=None):
+    """Primeiro arquivo do .zip com uma das extensões (ou o primeiro arquivo)."""
+    names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    if not names:
+        raise ValueError("Arquivo .zip vazio")
+    if extensions:
+        for name in names:
+            if name.lower().endswith(extensions):
+                return name
+    return names[0]
+
+
+def inner_name(source, filename, extensions=None):
+    """Nome do arquivo de dados contido na entrada (membro do .zip, se for o caso)."""
+    if compression_of(filename) != "zip":
+        return strip_compression(filename)
+    with zipfile.ZipFile(_rewind(source)) as archive:
+        return zip_member(archive, extensions)
+
+
+@contextmanager
+def open_decompressed(source, filename=None, extensions=None):
+    """
+    Abre `source` (caminho ou buffer binário) como um fluxo binário já descomprimido.
+    O codec vem da extensão de `filename` (padrão: o próprio caminho ou buffer.name).
+    Entradas sem compressão são devolvidas como estão (buffers rebobinados).
+    """
+    if isinstance(source, os.PathLike):
+        source = os.fspath(source)
+    filename = filename or (source if isinstance(source, str) else getattr(source, "name", ""))
+    codec = compression_of(filename)
+
+    with ExitStack() as stack:
+        if codec is None:
+            yield _rewind(source)
+            return
+
+        _rewind(source)
+        if codec == "gzip":
+            stream = _open_gzip(source)
+        elif codec == "bz2":
+            stream = bz2.open(source, "rb")
+        elif codec == "xz":
+            stream = lzma.open(source, "rb")
+        elif codec == "zstd":
+            stream = _open_zstd(source, stack)
+        else:
+            archive = stack.enter_context(zipfile.ZipFile(source))
+            stream = archive.open(zip_member(archive, extensions))
+
+        yield stack.enter_context(stream)
@@ -1,151 +1,181 @@
+import os
+
+import numpy as np
 import pandas as pd
 import sqlite3
 
-from urllib.request import urlopen, Request
-from bs4 import BeautifulSoup
+from utils.dates import parse_dates
+from utils.db import create_producao_indexes
+from utils.dedup import drop_duplicate_rows
+from utils.quality import QUARANTINE_REASON_COLUMN, evaluate_rules
+from utils.schemas import FOOD_PRODUCTION_CONTRACT, contract_rules
+
+
+def _report(progress, stage, df):
+    if progress:
+        progress(stage=stage, rows=len(df))
+
+
+ENGINES = ("pandas", "duckdb")
+
+
+def _check_engine(engine):
+    if engine not in ENGINES:
+        raise ValueError(f"Engine desconhecida: {engine!r} (opções: {', '.join(ENGINES)})")
+
+
+def clean_data(
+    df,
+    progress=None,
+    return_quarantine=False,
+    contract=None,
+    deduplicator=None,
+    engine="pandas",
+    deduplicate=True,
+):
+    """
+    Realiza a limpeza e padronização dos dados.
+    Com `return_quarantine=True` retorna (DataFrame limpo, quarentena com motivos).
+    Colunas já tipadas na leitura (contrato de schema) não são convertidas de novo.
+    Um `deduplicator` (utils.dedup.RowDeduplicator) estende a deduplicação a
+    blocos e arquivos já processados.
+    `engine="duckdb"` executa no DuckDB (multi-thread, out-of-core); nesse caso `df`
+    também pode ser o caminho de um CSV/Parquet, lido sem passar pelo pandas.
+    `deduplicate=False` pula a deduplicação, quando já foi feita por quem chamou
+    (ex.: utils.parallel, que deduplica o DataFrame inteiro antes de dividi-lo).
+    """
+    if df is None:
+        return (None, None) if return_quarantine else None
 
-import re
+    _check_engine(engine)
+    if engine == "duckdb":
+        if deduplicator is not None:
+            raise ValueError("A deduplicação entre cargas não é suportada com engine='duckdb'")
+        from utils.duckdb_engine import clean_data_duckdb
 
-
-def clean_data(df):
-    """Realiza a limpeza e padronização dos dados."""
-    if df is None:
-        return None
+        result = clean_data_duckdb(df, contract, return_quarantine)
+        _report(progress, "duckdb", result[0] if return_quarantine else result)
+        return result
 
     # Padronizar nomes de colunas
     df.columns = df.columns.str.lower()
 
-    # Remover duplicatas
-    df.drop_duplicates(inplace=True)
+    # Remover duplicatas (hash de 64 bits por linha)
+    if deduplicator is not None:
+        df = deduplicator.filter(df)
+    elif deduplicate:
+        df = drop_duplicate_rows(df)
+    _report(progress, "deduplicação", df)
 
-    # Variáveis categóricas
-    cat_cols = df.select_dtypes(include="object").columns
+    # Variáveis categóricas (nulos continuam nulos, para as regras not_null do contrato)
+    cat_cols = df.select_dtypes(include=["object", "string"]).columns
     for col in cat_cols:
-        df[col] = df[col].astype(str).str.strip().str.lower()
+        df[col] = df[col].astype(str).str.strip().str.lower().where(df[col].notna())
+    _report(progress, "padronização", df)
 
-    # Variáveis numéricas
+    # Variáveis numéricas (select_dtypes já garante o tipo; nulos vão para a quarentena)
     num_cols = df.select_dtypes(include=["int64", "float64"]).columns
-    for col in num_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-        if df[col].isnull().any():
-            df.dropna(subset=[col], inplace=True)
-
-    # Garantir tipos de dados e datas
-    df["order_date"] = pd.to_datetime(df["order_date"], errors="coerce")
-    df["ship_date"] = pd.to_datetime(df["ship_date"], errors="coerce")
-    df["customer_id"] = df["customer_id"].astype(str)
-    df["order_id"] = df["order_id"].astype(str)
-
-    df.dropna(subset=["order_date", "ship_date"], inplace=True)
-
+    _report(progress, "tipagem", df)
+
+    # Garantir tipos de dados e datas (texto original guardado para a quarentena)
+    raw_dates = df[["order_date", "ship_date"]].copy()
+    for col in ["order_date", "ship_date"]:
+        df[col] = parse_dates(df[col])
+    for col in ["customer_id", "order_id"]:
+        if not pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].astype(str)
+
+    # Linhas com numéricos ou datas inválidos vão para a quarentena
+    rules = [
+        {"code": f"{col.upper()}_INVALIDO", "check": "not_null", "column": col}
+        for col in [*num_cols, "order_date", "ship_date"]
+    ]
+    if contract is not None:
+        covered = {rule["column"] for rule in rules}
+        rules += [
+            rule
+            for rule in contract_rules(contract)
+            if rule["column"] in df.columns and rule["column"] not in covered
+        ]
+    df, quarantine, failed = evaluate_rules(df, rules, return_positions=True)
+    # Por posição: o índice de entrada pode ter rótulos repetidos (ex.: blocos concatenados)
+    for col in ["order_date", "ship_date"]:
+        quarantine[col] = raw_dates[col].array.take(failed)
+    _report(progress, "datas", df)
+
+    if return_quarantine:
+        return df, quarantine
     return df
 
 
-def extract_multinational_data(wiki_url):
-    """Extrai dados de supermercados multinacionais da Wikipedia."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    try:
-        req = Request(wiki_url, headers=headers)
-        with urlopen(req) as wiki_page:
-            soup = BeautifulSoup(wiki_page, "html.parser")
-
-        tabela = soup.find("table", class_="wikitable")
-        if not tabela:
-            return None, "Tabela não encontrada"
-
-        dados = []
-        linhas = tabela.find_all("tr")
-        cabecalho = [th.text.strip() for th in linhas[0].find_all("th")]
-
-        for linha in linhas[1:]:
-            colunas = linha.find_all(["td", "th"])
-            if len(colunas) > 0:
-                linha_dados = [coluna.text.strip() for coluna in colunas]
-                dados.append(linha_dados)
-
-        df = pd.DataFrame(dados, columns=cabecalho)
-
-        # Limpezas específicas
-        df.columns = df.columns.str.lower()
-        df = df.drop(columns=["map"], errors="ignore")
-
-        rename_map = {
-            "served countries (besides the headquarters)": "countries",
-            "number of locations": "locations",
-            "number of employees": "employees",
-        }
-        df = df.rename(columns=rename_map)
-
-        def extract_number(value):
-            if pd.isna(value) or str(value).strip() == "":
-                return None
-            numbers = re.sub(r"[^\d]", "", str(value))
-            return int(numbers) if numbers else None
-
-        df["locations"] = df["locations"].apply(extract_number)
-        df["employees"] = df["employees"].apply(extract_number)
+def _dimension(df, columns, key_col):
+    """
+    Monta uma dimensão com surrogate key inteira densa (1..n, na ordem da primeira
+    ocorrência) e retorna também a chave de cada linha de `df`, em uma só passada.
+    A posição da linha na dimensão é `chave - 1`.
+    """
+    codes = df.groupby(columns, sort=False, dropna=False).ngroup().to_numpy()
+    _, first_rows = np.unique(codes, return_index=True)
 
-        return df, "Sucesso"
+    dim = df.iloc[first_rows][columns].reset_index(drop=True)
+    dim[key_col] = np.arange(1, len(dim) + 1)
+    return dim, codes + 1
 
-    except Exception as e:
-        return None, str(e)
 
-
-def create_star_schema(df):
+def create_star_schema(df, progress=None, engine="pandas"):
     """Cria as tabelas de dimensão e fato."""
     if df is None:
         return {}
 
+    _check_engine(engine)
+    if engine == "duckdb":
+        from utils.duckdb_engine import create_star_schema_duckdb
+
+        schema = create_star_schema_duckdb(df)
+        _report(progress, "duckdb", schema["fato_vendas"])
+        return schema
+
     # Dimensão Tempo
-    dim_tempo = df[["order_date"]].drop_duplicates().copy()
+    dim_tempo = drop_duplicate_rows(df[["order_date"]]).copy()
     dim_tempo["date_id"] = dim_tempo["order_date"].dt.strftime("%Y%m%d").astype(int)
     dim_tempo["year"] = dim_tempo["order_date"].dt.year
     dim_tempo["weeknum"] = dim_tempo["order_date"].dt.isocalendar().week.astype(int)
     dim_tempo = dim_tempo[["date_id", "order_date", "year", "weeknum"]]
+    _report(progress, "dim_tempo", dim_tempo)
 
     # Dimensão Localização
-    dim_localizacao = (
-        df[["region", "country", "state", "city", "market", "market2"]]
-        .drop_duplicates()
-        .copy()
-    )
-    dim_localizacao["location_id"] = range(1, len(dim_localizacao) + 1)
+    join_cols = ["region", "country", "state", "city", "market", "market2"]
+    dim_localizacao, location_keys = _dimension(df, join_cols, "location_id")
+    _report(progress, "dim_localizacao", dim_localizacao)
 
     # Dimensão Envio
-    dim_envio = (
-        df[["order_id", "ship_date", "ship_mode", "shipping_cost"]]
-        .drop_duplicates()
-        .copy()
+    dim_envio, shipment_keys = _dimension(
+        df, ["order_id", "ship_date", "ship_mode", "shipping_cost"], "shipment_key"
     )
     dim_envio["order_id"] = dim_envio["order_id"].astype(str)
+    _report(progress, "dim_envio", dim_envio)
 
     # Dimensão Cliente
-    dim_cliente = (
-        df[["customer_id", "customer_name", "segment"]].drop_duplicates().copy()
+    dim_cliente, customer_keys = _dimension(
+        df, ["customer_id", "customer_name", "segment"], "customer_key"
     )
     dim_cliente["customer_id"] = dim_cliente["customer_id"].astype(str)
+    _report(progress, "dim_cliente", dim_cliente)
 
     # Dimensão Produto
-    dim_produto = (
-        df[["product_id", "product_name", "category", "sub_category"]]
-        .drop_duplicates()
-        .copy()
+    dim_produto, product_keys = _dimension(
+        df, ["product_id", "product_name", "category", "sub_category"], "product_key"
     )
     dim_produto["product_id"] = dim_produto["product_id"].astype(str)
+    _report(progress, "dim_produto", dim_produto)
 
-    # Tabela Fato
+    # Tabela Fato (surrogate keys já calculadas por linha; sem merge)
     fato = df.copy()
     fato["date_id"] = fato["order_date"].dt.strftime("%Y%m%d").astype(int)
-
-    # Merge para pegar Location ID (necessário garantir tipos str)
-    join_cols = ["region", "country", "state", "city", "market", "market2"]
-    for col in join_cols:
-        fato[col] = fato[col].astype(str)
-        dim_localizacao[col] = dim_localizacao[col].astype(str)
-
-    fato = fato.merge(dim_localizacao, on=join_cols, how="left")
+    fato["location_id"] = location_keys
+    fato["customer_key"] = customer_keys
+    fato["product_key"] = product_keys
+    fato["shipment_key"] = shipment_keys
 
     fato = fato[
         [
@@ -155,6 +185,9 @@ def create_star_schema(df):
             "product_id",
             "date_id",
             "location_id",
+            "customer_key",
+            "product_key",
+            "shipment_key",
             "order_priority",
             "sales",
             "profit",
@@ -162,6 +195,7 @@ def create_star_schema(df):
             "discount",
         ]
     ]
+    _report(progress, "fato_vendas", fato)
 
     return {
         "dim_tempo": dim_tempo,
@@ -173,16 +207,146 @@ def create_star_schema(df):
     }
 
 
-def run_food_production_etl(df, db_path):
-    """Executa o pipeline de dados de produção de alimentos."""
-    conn = sqlite3.connect(db_path)
+FOOD_COLUMNS = {
+    "produto": "produto",
+    "quantidade": "quantidade_produzida_kgs",
+    "preco": "valor_venda_medio",
+    "receita": "receita_total",
+}
+
+FOOD_PRODUCTION_RULES = [
+    {"code": "PRODUTO_NULO", "check": "not_null", "column": FOOD_COLUMNS["produto"]},
+    {
+        "code": "QTD_INVALIDA",
+        "check": "numeric",
+        "column": FOOD_COLUMNS["quantidade"],
+    },
+    {
+        "code": "QTD_MINIMA",
+        "check": "range",
+        "column": FOOD_COLUMNS["quantidade"],
+        "min": 10,
+        "inclusive": "neither",
+    },
+    {"code": "PRECO_INVALIDO", "check": "numeric", "column": FOOD_COLUMNS["preco"]},
+    {"code": "RECEITA_NULA", "check": "not_null", "column": FOOD_COLUMNS["receita"]},
+    {
+        "code": "RECEITA_FORMATO",
+        "check": "regex",
+        "column": FOOD_COLUMNS["receita"],
+        "pattern": r"\d+(\.\d+)*",
+    },
+]
+
+
+def transform_food_production(df, rules=FOOD_PRODUCTION_RULES):
+    """
+    Aplica as regras de qualidade e as transformações do pipeline de alimentos.
+    Retorna uma tupla: (DataFrame no schema da tabela producao, quarentena)
+    """
+    valid, quarantine = evaluate_rules(df, rules)
+
+    qtd = pd.to_numeric(valid[FOOD_COLUMNS["quantidade"]]).astype("int64")
+    preco = pd.to_numeric(valid[FOOD_COLUMNS["preco"]]).astype("float64")
+
+    # Sanitização: remove os pontos de milhar da receita
+    receita = (
+        pd.to_numeric(
+            valid[FOOD_COLUMNS["receita"]].astype(str).str.replace(".", "", regex=False)
+        )
+        .round(0)
+        .astype("int64")
+    )
+
+    out = pd.DataFrame(
+        {
+            "produto": valid[FOOD_COLUMNS["produto"]].astype(str),
+            "quantidade": qtd,
+            "preco_medio": preco,
+            "receita_total": receita,
+            "margem_lucro": ((receita / qtd) - preco).round(2),
+        }
+    )
+    return out, quarantine
+
+
+def _food_batches(sources, chunksize, engine):
+    """
+    Aplica as regras e transformações a cada fonte, em blocos de `chunksize` linhas.
+    Gera tuplas: (linhas lidas até o bloco, total de linhas ou None, saída, quarentena)
+    """
+    single = isinstance(sources, (pd.DataFrame, str, os.PathLike))
+    if single:
+        sources = [sources]
+    rows_read = 0
+
+    if engine == "duckdb":
+        from utils.duckdb_engine import connect, iter_food_production_duckdb
+
+        # Uma conexão para todas as fontes; cada fonte é lida em uma única passada
+        con = connect()
+        try:
+            for source in sources:
+                source_end = 0
+                for source_end, source_rows, out, quarantine in iter_food_production_duckdb(
+                    source, chunksize, con
+                ):
+                    yield rows_read + source_end, source_rows if single else None, out, quarantine
+                rows_read += source_end
+        finally:
+            con.close()
+        return
+
+    for source in sources:
+        if isinstance(source, (str, os.PathLike)):
+            from utils.readers import iter_file_chunks
+
+            # Caminhos são lidos em blocos, já tipados pelo contrato (total desconhecido)
+            chunks = iter_file_chunks(source, chunksize, contract=FOOD_PRODUCTION_CONTRACT)
+            total_rows = None
+        else:
+            chunks = (
+                source.iloc[start : start + chunksize] for start in range(0, len(source), chunksize)
+            )
+            total_rows = len(source) if single else None
+        for chunk in chunks:
+            out, quarantine = transform_food_production(chunk)
+            rows_read += len(chunk)
+            yield rows_read, total_rows, out, quarantine
+
+
+def run_food_production_etl(
+    df, db_path, chunksize=10_000, progress=None, if_exists="replace", engine="pandas"
+):
+    """
+    Executa o pipeline de dados de produção de alimentos.
+    Linhas reprovadas nas regras de qualidade vão para a tabela producao_quarentena.
+    `df` também pode ser um iterável de DataFrames (ex.: blocos de
+    utils.readers.iter_file_chunks): todos são carregados na mesma conexão e
+    transação, e os índices são criados uma única vez, ao final.
+    `if_exists="append"` acrescenta às tabelas existentes (carga de vários arquivos).
+    As fontes também podem ser caminhos: lidos em blocos com utils.readers (CSV ou
+    Excel) ou, com `engine="duckdb"`, direto pelo DuckDB (CSV/Parquet).
+    `engine="duckdb"` aplica as regras e transformações no DuckDB, em uma única
+    passada por fonte.
+    """
+    _check_engine(engine)
+    batches = _food_batches(df, chunksize, engine)
+
+    # Transação explícita: o sqlite3 confirmaria o DROP/CREATE na hora, e um erro ou
+    # cancelamento no meio da carga apagaria as tabelas da carga anterior
+    conn = sqlite3.connect(db_path, isolation_level=None)
     cursor = conn.cursor()
 
     try:
+        cursor.execute("BEGIN")
+
         # Schema
-        cursor.execute("DROP TABLE IF EXISTS producao")
+        if if_exists == "replace":
+            cursor.execute("DROP TABLE IF EXISTS producao")
+            cursor.execute("DROP TABLE IF EXISTS producao_quarentena")
         cursor.execute(
-            """CREATE TABLE producao (
+            """CREATE TABLE IF NOT EXISTS producao (
                         produto TEXT,
                         quantidade INTEGER,
                         preco_medio REAL,
@@ -190,44 +354,60 @@ def run_food_production_etl(df, db_path):
                         margem_lucro REAL
                     )"""
         )
+        cursor.execute(
+            """CREATE TABLE IF NOT EXISTS producao_quarentena (
+                        produto TEXT,
+                        quantidade_produzida_kgs TEXT,
+                        valor_venda_medio TEXT,
+                        receita_total TEXT,
+                        motivo TEXT
+                    )"""
+        )
 
         processed_count = 0
         rows_dropped = 0
 
-        c_prod = "produto"
-        c_qty = "quantidade_produzida_kgs"
-        c_price = "valor_venda_medio"
-        c_rev = "receita_total"
-
-        for index, row in df.iterrows():
-            try:
-                qtd = int(row[c_qty])
-            except ValueError:
-                continue
-
-            if qtd > 10:
-                receita_raw = str(row[c_rev])
-                try:
-                    receita_clean = int(round(float(receita_raw.replace(".", "")), 0))
-                except (ValueError, AttributeError):
-                    receita_clean = 0
-
-                try:
-                    preco = float(row[c_price])
-                    margem = round((receita_clean / qtd) - preco, 2)
-                except (ValueError, ZeroDivisionError, TypeError):
-                    margem = 0.0
-
-                cursor.execute(
-                    "INSERT INTO producao (produto, quantidade, preco_medio, receita_total, margem_lucro) VALUES (?, ?, ?, ?, ?)",
-                    (str(row[c_prod]), qtd, preco, receita_clean, margem),
+        for chunk_idx, (rows_read, total_rows, out, quarantine) in enumerate(batches, start=1):
+            cursor.executemany(
+                "INSERT INTO producao (produto, quantidade, preco_medio, receita_total, margem_lucro) VALUES (?, ?, ?, ?, ?)",
+                out.itertuples(index=False, name=None),
+            )
+            processed_count += len(out)
+
+            if not quarantine.empty:
+                cols = [*FOOD_COLUMNS.values(), QUARANTINE_REASON_COLUMN]
+                # Valores guardados como texto após a tipagem do contrato na leitura
+                # (ex.: "10" vira "10.0" e texto em coluna numérica chega como nulo);
+                # o motivo indica a regra violada
+                raw = quarantine[cols].astype(object).where(quarantine[cols].notna(), None)
+                cursor.executemany(
+                    "INSERT INTO producao_quarentena (produto, quantidade_produzida_kgs, valor_venda_medio, receita_total, motivo) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        tuple(None if v is None else str(v) for v in row)
+                        for row in raw.itertuples(index=False, name=None)
+                    ),
                 )
-                processed_count += 1
-            else:
-                rows_dropped += 1
+                rows_dropped += len(quarantine)
+
+            if progress:
+                info = {"stage": "carga", "rows": rows_read, "chunk": chunk_idx}
+                if total_rows is not None:
+                    info["total_rows"] = total_rows
+                    info["total_chunks"] = max(1, -(-total_rows // chunksize))
+                progress(**info)
 
-        conn.commit()
+        # Índices criados após a carga (mais rápido que mantê-los durante os INSERTs)
+        create_producao_indexes(cursor)
+
+        cursor.execute("COMMIT")
         return processed_count, rows_dropped
 
+    except Exception:
+        # Libera o lock de escrita mesmo se o traceback mantiver o cursor vivo
+        conn.rollback()
+        raise
+
     finally:
+        # Fecha também a conexão DuckDB dos blocos, se a carga parou no meio
+        batches.close()
         conn.close()
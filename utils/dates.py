@@ -0,0 +1,68 @@
+import pandas as pd
+
+# Formatos candidatos, na ordem de preferência em caso de ambiguidade
+# (ex.: "01/02/2012" casa com mês/dia e dia/mês; a amostra inteira decide).
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%m-%d-%Y",
+    "%Y/%m/%d",
+    "%Y%m%d",
+)
+
+
+def detect_date_format(values, sample_size=1000, formats=DATE_FORMATS, min_coverage=0.5):
+    """
+    Detecta o formato de data a partir de uma amostra de valores únicos.
+    Retorna o formato que converte a maior parte da amostra (valores sujos não
+    impedem a detecção), ou None se nenhum atingir `min_coverage`.
+    """
+    sample = pd.Series(pd.unique(pd.Series(values).dropna().astype(str)))
+    sample = sample[sample.str.strip() != ""].head(sample_size)
+    if sample.empty:
+        return None
+
+    best_format, best_coverage = None, 0.0
+    for fmt in formats:
+        coverage = pd.to_datetime(sample, format=fmt, errors="coerce").notna().mean()
+        if coverage == 1.0:
+            return fmt
+        if coverage > best_coverage:
+            best_format, best_coverage = fmt, coverage
+
+    return best_format if best_coverage >= min_coverage else None
+
+
+def parse_dates(values, date_format=None, sample_size=1000):
+    """
+    Converte uma coluna de datas (errors="coerce": inválidos viram NaT).
+    O formato é detectado uma vez a partir de uma amostra e cada string única é
+    convertida uma única vez (vendas têm poucas datas distintas frente às linhas).
+    Sem formato detectável, recai na inferência do pandas.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    series = pd.Series(values)
+    if date_format is None:
+        date_format = detect_date_format(series, sample_size)
+
+    codes, uniques = pd.factorize(series)
+    if date_format is not None:
+        parsed = pd.to_datetime(uniques, format=date_format, errors="coerce")
+    else:
+        parsed = pd.to_datetime(uniques, errors="coerce")
+
+    parsed = pd.DatetimeIndex(parsed)
+    if len(parsed) == 0:
+        return pd.Series(
+            pd.NaT, index=series.index, name=series.name, dtype="datetime64[ns]"
+        )
+
+    # codes == -1 (valores nulos) viram NaT
+    result = parsed.take(codes, allow_fill=True, fill_value=pd.NaT)
+    return pd.Series(result, index=series.index, name=series.name)
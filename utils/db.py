@@ -0,0 +1,134 @@
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+PRODUCAO_TABLE = "producao"
+
+# Colunas permitidas para ordenação (whitelist: nomes não podem ser parametrizados)
+PRODUCAO_COLUMNS = (
+    "produto",
+    "quantidade",
+    "preco_medio",
+    "receita_total",
+    "margem_lucro",
+)
+
+
+def create_producao_indexes(cursor):
+    """Cria os índices usados pela paginação, filtros e ordenação da tabela producao."""
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_{PRODUCAO_TABLE}_produto ON {PRODUCAO_TABLE} (produto)"
+    )
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_{PRODUCAO_TABLE}_quantidade ON {PRODUCAO_TABLE} (quantidade)"
+    )
+
+
+def table_exists(db_path, table=PRODUCAO_TABLE):
+    """Verifica se a tabela existe no banco SQLite (sem criar o arquivo se ele não existir)."""
+    if not Path(db_path).exists():
+        return False
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        return row is not None
+    finally:
+        conn.close()
+
+
+def _build_where(produto_filter=None, min_quantidade=None):
+    clauses = []
+    params = []
+
+    if produto_filter:
+        # Intervalo de prefixo (em vez de LIKE) para aproveitar o índice de produto
+        clauses.append("produto >= ? AND produto < ?")
+        prefix = produto_filter.strip()
+        params.extend([prefix, prefix + "\uffff"])
+
+    if min_quantidade is not None:
+        clauses.append("quantidade >= ?")
+        params.append(int(min_quantidade))
+
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+def query_producao_page(
+    db_path,
+    offset=0,
+    limit=100,
+    order_by="produto",
+    descending=False,
+    produto_filter=None,
+    min_quantidade=None,
+):
+    """
+    Consulta uma página da tabela producao com filtro e ordenação no SQLite.
+    Retorna uma tupla: (DataFrame da página, total de linhas do filtro)
+    """
+    if order_by not in PRODUCAO_COLUMNS:
+        raise ValueError(f"Coluna de ordenação inválida: {order_by}")
+
+    direction = "DESC" if descending else "ASC"
+    where, params = _build_where(produto_filter, min_quantidade)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM {PRODUCAO_TABLE}{where}", params
+        ).fetchone()[0]
+
+        # rowid como desempate garante páginas estáveis
+        df_page = pd.read_sql(
+            f"SELECT {', '.join(PRODUCAO_COLUMNS)} FROM {PRODUCAO_TABLE}{where} "
+            f"ORDER BY {order_by} {direction}, rowid {direction} LIMIT ? OFFSET ?",
+            conn,
+            params=[*params, int(limit), int(offset)],
+        )
+        return df_page, total
+    finally:
+        conn.close()
+
+
+def producao_summary(db_path, produto_filter=None, min_quantidade=None):
+    """Calcula os agregados da tabela producao diretamente no SQLite."""
+    where, params = _build_where(produto_filter, min_quantidade)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute(
+            f"""SELECT COUNT(*),
+                       COALESCE(SUM(quantidade), 0),
+                       COALESCE(SUM(receita_total), 0),
+                       AVG(margem_lucro)
+                FROM {PRODUCAO_TABLE}{where}""",
+            params,
+        ).fetchone()
+    finally:
+        conn.close()
+
+    return {
+        "registros": row[0],
+        "quantidade_total": row[1],
+        "receita_total": row[2],
+        "margem_media": row[3],
+    }
+
+
+def quarantine_summary(db_path, table=f"{PRODUCAO_TABLE}_quarentena"):
+    """Contagem de linhas em quarentena por motivo, calculada no SQLite."""
+    if not table_exists(db_path, table):
+        return pd.DataFrame(columns=["motivo", "linhas"])
+
+    conn = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql(
+            f"SELECT motivo, COUNT(*) AS linhas FROM {table} GROUP BY motivo ORDER BY linhas DESC",
+            conn,
+        )
+    finally:
+        conn.close()
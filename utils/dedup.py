@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Deduplicação por impressão digital (hash de 64 bits por linha).
+# A memória do conjunto de "já vistos" é de 8 bytes por chave distinta,
+# independente da largura da linha. A chance de colisão com 64 bits é
+# desprezível para volumes de bilhões de linhas (~n²/2^65).
+#
+# Observação: o hash depende do dtype (1 e 1.0 geram impressões diferentes);
+# use contratos de schema (utils.schemas) para manter os tipos estáveis entre blocos.
+
+
+def row_fingerprints(df, subset=None):
+    """Hash de 64 bits de cada linha (ou das colunas de `subset`), vetorizado."""
+    data = df if subset is None else df[list(subset)]
+    return pd.util.hash_pandas_object(data, index=False).to_numpy(dtype=np.uint64)
+
+
+def drop_duplicate_rows(df, subset=None):
+    """Equivalente a drop_duplicates (mantém a primeira ocorrência), comparando hashes."""
+    fingerprints = row_fingerprints(df, subset)
+    return df.take(np.flatnonzero(~pd.Series(fingerprints).duplicated().to_numpy()))
+
+
+def _merge_sorted(a, b):
+    """Intercala dois arrays ordenados e disjuntos sem reordenar o conjunto inteiro."""
+    if a.size < b.size:
+        a, b = b, a
+    if b.size == 0:
+        return a
+    return np.insert(a, np.searchsorted(a, b), b)
+
+
+class _SortedRuns:
+    """
+    Conjunto de impressões digitais em blocos ordenados de tamanhos decrescentes.
+    Um bloco novo só é intercalado com os vizinhos de tamanho parecido, então cada
+    chave é copiada O(log n) vezes no total (em vez de reordenar tudo a cada bloco).
+    """
+
+    def __init__(self, values=None):
+        self.runs = []
+        if values is not None and values.size:
+            # O estado salvo já vem ordenado; só ordena se necessário
+            if not (values[1:] > values[:-1]).all():
+                values = np.unique(values)
+            self.runs.append(values)
+
+    @property
+    def size(self):
+        return sum(run.size for run in self.runs)
+
+    def add(self, values):
+        """Acrescenta chaves ordenadas que ainda não estão no conjunto."""
+        if values.size == 0:
+            return
+        self.runs.append(values)
+        while len(self.runs) > 1 and self.runs[-2].size <= 2 * self.runs[-1].size:
+            last = self.runs.pop()
+            self.runs.append(_merge_sorted(self.runs.pop(), last))
+
+    def contains(self, fingerprints):
+        if not self.runs:
+            return np.zeros(fingerprints.size, dtype=bool)
+        # Buscas com as chaves ordenadas percorrem cada bloco em sequência (bem mais rápido)
+        order = np.argsort(fingerprints)
+        needles = fingerprints[order]
+        found_sorted = np.zeros(needles.size, dtype=bool)
+        for run in self.runs:
+            pos = np.searchsorted(run, needles)
+            pos[pos == run.size] = 0
+            found_sorted |= run[pos] == needles
+        found = np.empty_like(found_sorted)
+        found[order] = found_sorted
+        return found
+
+    def to_array(self):
+        merged = np.empty(0, dtype=np.uint64)
+        for run in self.runs:
+            merged = _merge_sorted(merged, run)
+        return merged
+
+
+class RowDeduplicator:
+    """
+    Conjunto persistente de impressões digitais já vistas, para deduplicar
+    entre blocos (chunks) e entre arquivos de cargas incrementais.
+
+    As chaves novas ficam pendentes até `commit()` (chamado quando a carga do
+    arquivo termina); `rollback()` as descarta se a carga falhar, e `save()`
+    grava apenas o conjunto confirmado.
+    """
+
+    def __init__(self, subset=None, state_path=None):
+        self.subset = list(subset) if subset is not None else None
+        self.state_path = state_path
+        self._seen = _SortedRuns()
+        self._pending = _SortedRuns()
+
+        if state_path and os.path.exists(state_path):
+            self._seen = _SortedRuns(np.load(state_path))
+
+    def __len__(self):
+        return self._seen.size + self._pending.size
+
+    def filter(self, df):
+        """Retorna apenas as linhas nunca vistas (nem neste bloco, nem nos anteriores)."""
+        fingerprints = row_fingerprints(df, self.subset)
+
+        first_in_chunk = ~pd.Series(fingerprints).duplicated().to_numpy()
+        keep = first_in_chunk & ~self._seen.contains(fingerprints)
+        keep &= ~self._pending.contains(fingerprints)
+
+        self._pending.add(np.sort(fingerprints[keep]))
+        return df.take(np.flatnonzero(keep))
+
+    def commit(self):
+        """Confirma as chaves pendentes (a carga que as filtrou foi gravada)."""
+        for run in self._pending.runs:
+            self._seen.add(run)
+        self._pending = _SortedRuns()
+
+    def rollback(self):
+        """Descarta as chaves pendentes (a carga que as filtrou falhou)."""
+        self._pending = _SortedRuns()
+
+    def save(self, state_path=None):
+        """Persiste o conjunto confirmado de impressões digitais (.npy)."""
+        path = state_path or self.state_path
+        if path is None:
+            raise ValueError("Informe o caminho para salvar o estado da deduplicação")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        merged = self._seen.to_array()
+        self._seen.runs = [merged] if merged.size else []
+        # Grava via arquivo aberto para np.save não acrescentar a extensão .npy
+        with open(path, "wb") as f:
+            np.save(f, merged)
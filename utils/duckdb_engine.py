@@ -0,0 +1,413 @@
+"""
+Backend DuckDB (multi-thread, out-of-core) para as transformações do core.
+
+As funções aceitam um DataFrame ou o caminho de um arquivo CSV/Parquet; com
+caminho, o DuckDB lê o arquivo em streaming e só materializa o resultado,
+despejando em disco (temp_directory) o que não couber na memória. Os
+resultados são equivalentes aos do caminho pandas em utils.core.
+"""
+
+import os
+from contextlib import contextmanager
+
+from utils.dates import detect_date_format
+from utils.schemas import FOOD_PRODUCTION_CONTRACT, contract_rules, resolve_columns
+
+DATE_COLUMNS = ["order_date", "ship_date"]
+ROW_NUMBER = "__rn"
+# Tipos do contrato -> DuckDB (datas lidas como texto e convertidas com o formato detectado)
+DUCKDB_TYPES = {"str": "VARCHAR", "float64": "DOUBLE", "int64": "BIGINT", "datetime": "VARCHAR"}
+# Marcadores de nulo padrão do pd.read_csv ("n/a", "NULL", ...), para a leitura
+# do DuckDB ver os mesmos nulos que o caminho pandas
+NULL_STRINGS = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+
+def connect(threads=None, memory_limit=None, temp_directory=None):
+    """Abre uma conexão DuckDB em memória com limites opcionais de recursos."""
+    import duckdb
+
+    con = duckdb.connect()
+    if threads:
+        con.execute(f"SET threads = {int(threads)}")
+    if memory_limit:
+        con.execute(f"SET memory_limit = '{memory_limit}'")
+    if temp_directory:
+        con.execute(f"SET temp_directory = '{temp_directory}'")
+    return con
+
+
+@contextmanager
+def _connection(con=None):
+    """Usa a conexão recebida ou abre uma própria, fechada ao sair do bloco."""
+    if con is not None:
+        yield con
+        return
+    con = connect()
+    try:
+        yield con
+    finally:
+        con.close()
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _csv_relation(con, path, contract):
+    """
+    read_csv com as colunas informadas: sem isso o DuckDB refaz a detecção do
+    formato (amostra do arquivo) a cada consulta que referencia o arquivo.
+    Com contrato, tudo é lido como texto e tipado depois (ver _register_source).
+    """
+    if contract is not None:
+        import pandas as pd
+
+        columns = [(col, "VARCHAR") for col in pd.read_csv(path, nrows=0).columns]
+    else:
+        columns = con.execute(f"DESCRIBE SELECT * FROM read_csv({_literal(path)})").fetchall()
+    spec = ", ".join(f"{_literal(row[0])}: {_literal(row[1])}" for row in columns)
+    nulls = ", ".join(_literal(value) for value in NULL_STRINGS)
+    return (
+        f"read_csv({_literal(path)}, header = true, auto_detect = false, "
+        f"columns = {{{spec}}}, nullstr = [{nulls}])"
+    )
+
+
+def _register_source(con, source, name, contract=None):
+    """
+    Cria a view `name` com as colunas em minúsculas e o número da linha original
+    (para reproduzir a ordem e o 'mantém a primeira ocorrência' do pandas).
+    Com contrato, os numéricos são convertidos com TRY_CAST: valores fora do tipo
+    viram nulos (como utils.schemas.coerce_to_contract) em vez de abortar a leitura.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.endswith(".parquet"):
+            relation = f"read_parquet({_literal(path)})"
+        else:
+            relation = _csv_relation(con, path, contract)
+    else:
+        con.register(f"{name}_df", source)
+        relation = f"{name}_df"
+
+    header = [row[0] for row in con.execute(f"DESCRIBE SELECT * FROM {relation}").fetchall()]
+    if contract is not None:
+        mapping = resolve_columns(header, contract)
+    else:
+        mapping = {c: c.lower() for c in header}
+
+    select = []
+    for raw, col in mapping.items():
+        duck_type = DUCKDB_TYPES.get(contract["columns"][col]["dtype"]) if contract else None
+        if duck_type in ("DOUBLE", "BIGINT"):
+            select.append(f"TRY_CAST({_quote(raw)} AS {duck_type}) AS {_quote(col)}")
+        else:
+            select.append(f"{_quote(raw)} AS {_quote(col)}")
+    con.execute(
+        f"CREATE OR REPLACE TEMP VIEW {name} AS "
+        f"SELECT {', '.join(select)}, row_number() OVER () AS {ROW_NUMBER} FROM {relation}"
+    )
+
+
+def _fetch(con, sql):
+    """Materializa o resultado via Arrow (bem mais rápido que .df() em colunas texto)."""
+    return con.sql(sql).to_arrow_table().to_pandas()
+
+
+def _column_types(con, relation):
+    rows = con.execute(f"DESCRIBE SELECT * FROM {relation}").fetchall()
+    return {row[0]: row[1] for row in rows if row[0] != ROW_NUMBER}
+
+
+def _is_numeric(duck_type):
+    return duck_type.split("(")[0] in (
+        "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
+        "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT",
+        "FLOAT", "DOUBLE", "DECIMAL",
+    )
+
+
+def _date_expression(con, relation, column, duck_type):
+    if duck_type.startswith(("TIMESTAMP", "DATE")):
+        return f"CAST({_quote(column)} AS TIMESTAMP)"
+
+    # Amostra das primeiras linhas (leitura em streaming, sem varrer o arquivo todo)
+    sample = [
+        row[0]
+        for row in con.execute(
+            f"SELECT lower(trim({_quote(column)})) FROM {relation} "
+            f"WHERE {_quote(column)} IS NOT NULL LIMIT 1000"
+        ).fetchall()
+    ]
+    fmt = detect_date_format(sample)
+    if fmt is None:
+        return f"TRY_CAST({_quote(column)} AS TIMESTAMP)"
+    return f"try_strptime({_quote(column)}, '{fmt}')"
+
+
+def _create_typed(con, source, contract):
+    """
+    Cria a tabela `typed` (deduplicada, padronizada e tipada) e retorna
+    (colunas, {coluna: código da regra}, condição de linha válida).
+    """
+    _register_source(con, source, "raw", contract)
+    types = _column_types(con, "raw")
+    columns = list(types)
+
+    # Remover duplicatas (mantém a primeira ocorrência; nulos são iguais entre si)
+    col_list = ", ".join(_quote(c) for c in columns)
+    con.execute(
+        f"CREATE OR REPLACE TEMP VIEW dedup AS "
+        f"SELECT {col_list}, min({ROW_NUMBER}) AS {ROW_NUMBER} FROM raw GROUP BY ALL"
+    )
+
+    # Variáveis categóricas (texto) padronizadas; nulos continuam nulos, para que
+    # as regras not_null do contrato valham sobre o valor bruto
+    normalized = []
+    for col in columns:
+        if types[col] == "VARCHAR":
+            normalized.append(f"lower(trim({_quote(col)})) AS {_quote(col)}")
+        else:
+            normalized.append(_quote(col))
+    con.execute(
+        f"CREATE OR REPLACE TEMP VIEW normalized AS "
+        f"SELECT {', '.join(normalized)}, {ROW_NUMBER} FROM dedup"
+    )
+
+    # Datas e ids tipados
+    typed = []
+    for col in columns:
+        if col in DATE_COLUMNS:
+            expr = _date_expression(con, "raw", col, types[col])
+            typed.append(f"{expr} AS {_quote(col)}")
+            typed.append(f"{_quote(col)} AS {_quote('__raw_' + col)}")
+        elif col in ("customer_id", "order_id"):
+            typed.append(f"CAST({_quote(col)} AS VARCHAR) AS {_quote(col)}")
+        else:
+            typed.append(_quote(col))
+    con.execute(
+        f"CREATE OR REPLACE TEMP TABLE typed AS "
+        f"SELECT {', '.join(typed)}, {ROW_NUMBER} FROM normalized"
+    )
+
+    # Regras: numéricos e datas não nulos (mesmos códigos do caminho pandas)
+    rules = {
+        c: f"{c.upper()}_INVALIDO"
+        for c in [*(c for c in columns if _is_numeric(types[c])), *DATE_COLUMNS]
+    }
+    if contract is not None:
+        for rule in contract_rules(contract):
+            if rule["column"] in types:
+                rules.setdefault(rule["column"], rule["code"])
+    valid = " AND ".join(f"{_quote(c)} IS NOT NULL" for c in rules) or "TRUE"
+    return columns, rules, valid
+
+
+def _fetch_quarantine(con, columns, rules, valid):
+    reasons = ", ".join(
+        f"CASE WHEN {_quote(c)} IS NULL THEN '{code}' END" for c, code in rules.items()
+    )
+    raw_cols = ", ".join(
+        f"{_quote('__raw_' + c)} AS {_quote(c)}" if c in DATE_COLUMNS else _quote(c)
+        for c in columns
+    )
+    return _fetch(
+        con,
+        f"SELECT {raw_cols}, concat_ws(';', {reasons}) AS motivo "
+        f"FROM typed WHERE NOT ({valid}) ORDER BY {ROW_NUMBER}",
+    )
+
+
+def clean_data_duckdb(source, contract=None, return_quarantine=False, con=None):
+    """Equivalente a utils.core.clean_data executado no DuckDB."""
+    with _connection(con) as con:
+        columns, rules, valid = _create_typed(con, source, contract)
+        output_cols = ", ".join(_quote(c) for c in columns)
+
+        df_clean = _fetch(
+            con, f"SELECT {output_cols} FROM typed WHERE {valid} ORDER BY {ROW_NUMBER}"
+        )
+        if not return_quarantine:
+            return df_clean
+        return df_clean, _fetch_quarantine(con, columns, rules, valid)
+
+
+DIMENSIONS = {
+    "dim_localizacao": (
+        ["region", "country", "state", "city", "market", "market2"],
+        "location_id",
+    ),
+    "dim_envio": (["order_id", "ship_date", "ship_mode", "shipping_cost"], "shipment_key"),
+    "dim_cliente": (["customer_id", "customer_name", "segment"], "customer_key"),
+    "dim_produto": (
+        ["product_id", "product_name", "category", "sub_category"],
+        "product_key",
+    ),
+}
+
+
+def _hash(columns, alias=None):
+    prefix = f"{alias}." if alias else ""
+    return f"hash({', '.join(prefix + _quote(c) for c in columns)})"
+
+
+def _star_schema(con):
+    """Monta as tabelas do Star Schema a partir da tabela `clean` (com __rn)."""
+    tables = {}
+    tables["dim_tempo"] = _fetch(
+        con,
+        f"""SELECT CAST(strftime(order_date, '%Y%m%d') AS INTEGER) AS date_id,
+                   order_date,
+                   year(order_date) AS year,
+                   CAST(weekofyear(order_date) AS INTEGER) AS weeknum
+            FROM (SELECT order_date, min({ROW_NUMBER}) AS first_rn FROM clean GROUP BY ALL)
+            ORDER BY first_rn""",
+    )
+
+    # Chave = ordem da primeira ocorrência da combinação (como o ngroup do pandas).
+    # O join usa o hash de 64 bits das colunas como chave do hash join e confere
+    # as colunas naturais (IS NOT DISTINCT FROM: nulos são iguais), de modo que
+    # uma colisão de hash não liga a linha à dimensão errada.
+    joins = []
+    for name, (columns, key_col) in DIMENSIONS.items():
+        cols = ", ".join(_quote(c) for c in columns)
+        con.execute(
+            f"""CREATE OR REPLACE TEMP TABLE {name} AS
+                SELECT {cols}, {_hash(columns)} AS __hash,
+                       row_number() OVER (ORDER BY min({ROW_NUMBER})) AS {_quote(key_col)}
+                FROM clean GROUP BY ALL"""
+        )
+        tables[name] = _fetch(
+            con, f"SELECT {cols}, {_quote(key_col)} FROM {name} ORDER BY {_quote(key_col)}"
+        )
+        matches = " AND ".join(
+            f"{name}.{_quote(c)} IS NOT DISTINCT FROM f.{_quote(c)}" for c in columns
+        )
+        joins.append(f"JOIN {name} ON {name}.__hash = {_hash(columns, 'f')} AND {matches}")
+
+    tables["fato_vendas"] = _fetch(
+        con,
+        f"""SELECT f.row_id, f.order_id, f.customer_id, f.product_id,
+                   CAST(strftime(f.order_date, '%Y%m%d') AS INTEGER) AS date_id,
+                   dim_localizacao.location_id,
+                   dim_cliente.customer_key,
+                   dim_produto.product_key,
+                   dim_envio.shipment_key,
+                   f.order_priority, f.sales, f.profit, f.quantity, f.discount
+            FROM clean f
+            {' '.join(joins)}
+            ORDER BY f.{ROW_NUMBER}""",
+    )
+    return tables
+
+
+def create_star_schema_duckdb(df, con=None):
+    """Equivalente a utils.core.create_star_schema executado no DuckDB."""
+    with _connection(con) as con:
+        con.register("clean_df", df)
+        con.execute(
+            f"CREATE OR REPLACE TEMP TABLE clean AS "
+            f"SELECT *, row_number() OVER () AS {ROW_NUMBER} FROM clean_df"
+        )
+        return _star_schema(con)
+
+
+def star_schema_from_source_duckdb(source, contract=None, con=None):
+    """
+    Limpeza + Star Schema em uma única conexão: os dados limpos ficam no DuckDB
+    e só as tabelas finais passam para o pandas.
+    Retorna uma tupla: (tabelas, linhas distintas, linhas limpas)
+    """
+    with _connection(con) as con:
+        columns, rules, valid = _create_typed(con, source, contract)
+        output_cols = ", ".join(_quote(c) for c in columns)
+        # Sem ORDER BY: o Star Schema ordena pela coluna __rn onde a ordem importa
+        con.execute(
+            f"CREATE OR REPLACE TEMP TABLE clean AS "
+            f"SELECT {output_cols}, {ROW_NUMBER} FROM typed WHERE {valid}"
+        )
+        rows_in = con.execute("SELECT count(*) FROM typed").fetchone()[0]
+        rows_clean = con.execute("SELECT count(*) FROM clean").fetchone()[0]
+        return _star_schema(con), rows_in, rows_clean
+
+
+def _create_food_checked(con, source):
+    """Cria a tabela `food_checked` com o motivo de rejeição de cada linha."""
+    _register_source(con, source, "food", FOOD_PRODUCTION_CONTRACT)
+
+    qty = "TRY_CAST(quantidade_produzida_kgs AS DOUBLE)"
+    price = "TRY_CAST(valor_venda_medio AS DOUBLE)"
+    rev = "CAST(receita_total AS VARCHAR)"
+    reasons = f"""concat_ws(';',
+        CASE WHEN produto IS NULL THEN 'PRODUTO_NULO' END,
+        CASE WHEN {qty} IS NULL THEN 'QTD_INVALIDA' END,
+        CASE WHEN {qty} IS NOT NULL AND {qty} <= 10 THEN 'QTD_MINIMA' END,
+        CASE WHEN {price} IS NULL THEN 'PRECO_INVALIDO' END,
+        CASE WHEN receita_total IS NULL THEN 'RECEITA_NULA' END,
+        CASE WHEN receita_total IS NOT NULL
+              AND NOT regexp_full_match({rev}, '\\d+(\\.\\d+)*') THEN 'RECEITA_FORMATO' END
+    )"""
+    con.execute(
+        f"CREATE OR REPLACE TEMP TABLE food_checked AS "
+        f"SELECT *, {reasons} AS motivo FROM food"
+    )
+
+
+def _food_batch(con, where):
+    qty = "TRY_CAST(quantidade_produzida_kgs AS DOUBLE)"
+    price = "TRY_CAST(valor_venda_medio AS DOUBLE)"
+    rev = "CAST(receita_total AS VARCHAR)"
+    receita = f"CAST(round(CAST(replace({rev}, '.', '') AS DOUBLE)) AS BIGINT)"
+    quantidade = f"CAST(trunc({qty}) AS BIGINT)"
+    # Arredondamento como o Series.round do pandas (meio para o par, sobre x * 100)
+    out = _fetch(
+        con,
+        f"""SELECT CAST(produto AS VARCHAR) AS produto,
+                   {quantidade} AS quantidade,
+                   {price} AS preco_medio,
+                   {receita} AS receita_total,
+                   round_even(({receita} / {quantidade} - {price}) * 100, 0) / 100 AS margem_lucro
+            FROM food_checked WHERE motivo = '' AND {where} ORDER BY {ROW_NUMBER}""",
+    )
+    quarantine = _fetch(
+        con,
+        f"""SELECT produto, quantidade_produzida_kgs, valor_venda_medio, receita_total, motivo
+            FROM food_checked WHERE motivo <> '' AND {where} ORDER BY {ROW_NUMBER}""",
+    )
+    return out, quarantine
+
+
+def transform_food_production_duckdb(source, con=None):
+    """
+    Equivalente a utils.core.transform_food_production executado no DuckDB.
+    Retorna uma tupla: (DataFrame no schema da tabela producao, quarentena)
+    """
+    with _connection(con) as con:
+        _create_food_checked(con, source)
+        return _food_batch(con, "TRUE")
+
+
+def iter_food_production_duckdb(source, chunksize, con=None):
+    """
+    Aplica as regras ao arquivo (ou DataFrame) inteiro de uma vez e devolve o
+    resultado em blocos de `chunksize` linhas de entrada, para a carga no SQLite
+    sem materializar tudo no pandas.
+    Gera tuplas: (linhas lidas até o bloco, total de linhas, saída, quarentena)
+    """
+    with _connection(con) as con:
+        _create_food_checked(con, source)
+        total_rows = con.execute("SELECT count(*) FROM food_checked").fetchone()[0]
+        # __rn é crescente na tabela, então cada faixa lê só os seus row groups
+        for start in range(0, total_rows, chunksize):
+            end = min(start + chunksize, total_rows)
+            out, quarantine = _food_batch(
+                con, f"{ROW_NUMBER} > {start} AND {ROW_NUMBER} <= {end}"
+            )
+            yield end, total_rows, out, quarantine
@@ -0,0 +1,180 @@
+"""
+Leitura de Excel em streaming, linha a linha, sem montar o modelo de objetos
+(células, estilos) que o pd.read_excel cria com o openpyxl padrão.
+
+Engines, na ordem de preferência:
+    - calamine (pip install python-calamine): leitor em Rust, bem mais rápido;
+      lê .xlsx e .xls;
+    - openpyxl em modo read_only: itera as linhas do XML sob demanda (.xlsx).
+As linhas são acumuladas em blocos e convertidas para colunas de uma vez.
+"""
+
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from utils.schemas import coerce_to_contract, resolve_columns
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Textos tratados como nulos (os mesmos padrões do pd.read_excel/pd.read_csv)
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+
+def _calamine_rows(source, sheet_name):
+    from python_calamine import CalamineWorkbook
+
+    if isinstance(source, str):
+        workbook = CalamineWorkbook.from_path(source)
+    else:
+        workbook = CalamineWorkbook.from_filelike(source)
+
+    if isinstance(sheet_name, int):
+        sheet = workbook.get_sheet_by_index(sheet_name)
+    else:
+        sheet = workbook.get_sheet_by_name(sheet_name)
+
+    # Células vazias vêm como "" e são convertidas para nulo em _to_frame
+    yield from sheet.iter_rows()
+
+
+def _openpyxl_rows(source, sheet_name):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        if isinstance(sheet_name, int):
+            sheet = workbook.worksheets[sheet_name]
+        else:
+            sheet = workbook[sheet_name]
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _iter_rows(source, sheet_name, filename):
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        if filename.lower().endswith(".xls"):
+            raise ImportError(
+                "Leitura de .xls requer o python-calamine (pip install python-calamine)"
+            )
+        return _openpyxl_rows(source, sheet_name)
+    return _calamine_rows(source, sheet_name)
+
+
+def _select(header, usecols, contract):
+    """Índices e nomes das colunas a manter (por nome, posição ou contrato)."""
+    if contract is not None:
+        usecols = list(resolve_columns(header, contract))
+
+    if usecols is None:
+        positions = range(len(header))
+    else:
+        by_name = {name: i for i, name in enumerate(header)}
+        missing = [col for col in usecols if not isinstance(col, int) and col not in by_name]
+        if missing:
+            raise ValueError(f"Colunas não encontradas na planilha: {', '.join(missing)}")
+        positions = [col if isinstance(col, int) else by_name[col] for col in usecols]
+
+    positions = list(positions)
+    return positions, [header[i] for i in positions]
+
+
+def _to_frame(rows, positions, names):
+    """Converte um bloco de linhas em colunas, deixando o pandas inferir os tipos."""
+    if len(positions) == 1:
+        columns = [[row[positions[0]] for row in rows]]
+    else:
+        getter = itemgetter(*positions)
+        columns = list(zip(*(getter(row) for row in rows))) or [[] for _ in names]
+    df = pd.DataFrame({name: list(values) for name, values in zip(names, columns)})
+
+    # Mesmos tipos do pd.read_excel: textos nulos viram NaN, e o calamine devolve
+    # números como float e datas sem hora como datetime.date
+    for name in df.columns:
+        col = df[name]
+        if col.dtype == object or pd.api.types.is_string_dtype(col):
+            col = col.where(~col.isin(NA_VALUES)).infer_objects()
+            df[name] = col
+
+        if col.dtype == "float64":
+            values = col.to_numpy()
+            if not np.isnan(values).any() and (values % 1 == 0).all():
+                df[name] = values.astype("int64")
+        elif col.dtype == object and pd.api.types.infer_dtype(col, skipna=True) in (
+            "date",
+            "datetime",
+        ):
+            df[name] = pd.to_datetime(col)
+    return df
+
+
+def iter_excel_chunks(
+    source,
+    chunksize=DEFAULT_CHUNKSIZE,
+    sheet_name=0,
+    usecols=None,
+    contract=None,
+    filename=None,
+):
+    """
+    Lê uma planilha em blocos de `chunksize` linhas.
+    `source`: caminho ou buffer; `sheet_name`: índice ou nome da aba;
+    `usecols`: nomes ou posições das colunas; com um contrato (utils.schemas),
+    lê só as colunas do contrato e as converte para os tipos definidos.
+    """
+    filename = filename or (source if isinstance(source, str) else getattr(source, "name", ""))
+    rows = _iter_rows(source, sheet_name, filename)
+
+    header = None
+    for row in rows:
+        if any(value not in (None, "") for value in row):
+            header = [str(value).strip() if value is not None else "" for value in row]
+            break
+    if header is None:
+        return
+
+    positions, names = _select(header, usecols, contract)
+    width = len(header)
+
+    block = []
+    for row in rows:
+        if all(value is None or value == "" for value in row):
+            continue
+        if len(row) < width:
+            row = list(row) + [None] * (width - len(row))
+        block.append(row)
+        if len(block) >= chunksize:
+            yield _finish(_to_frame(block, positions, names), contract)
+            block = []
+
+    if block:
+        yield _finish(_to_frame(block, positions, names), contract)
+
+
+def _finish(df, contract):
+    return df if contract is None else coerce_to_contract(df, contract)
+
+
+def read_excel(source, sheet_name=0, usecols=None, contract=None, filename=None):
+    """Lê a planilha inteira em streaming (blocos concatenados no fim)."""
+    chunks = list(
+        iter_excel_chunks(
+            source,
+            sheet_name=sheet_name,
+            usecols=usecols,
+            contract=contract,
+            filename=filename,
+        )
+    )
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
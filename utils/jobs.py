@@ -0,0 +1,111 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Pool compartilhado entre todas as sessões do Streamlit (módulo importado uma vez por processo)
+MAX_WORKERS = 2
+# Jobs finalizados e nunca coletados (ex.: aba fechada) são descartados após este prazo (s)
+FINISHED_JOB_TTL = 30 * 60
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="pipeline")
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """Sinaliza que a execução foi cancelada pelo usuário."""
+
+
+class Job:
+    """Execução em segundo plano de uma etapa do pipeline, com progresso e cancelamento."""
+
+    def __init__(self, name):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.future = None
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._progress = {}
+        self.finished_at = None
+
+    def _mark_finished(self, _future):
+        self.finished_at = time.monotonic()
+
+    def report(self, **info):
+        """Callback de progresso repassado às funções do core; interrompe se cancelado."""
+        if self._cancel_event.is_set():
+            raise JobCancelled(f"{self.name} cancelado")
+        with self._lock:
+            self._progress.update(info)
+
+    @property
+    def progress(self):
+        with self._lock:
+            return dict(self._progress)
+
+    def cancel(self):
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def status(self):
+        if self.future.cancelled():
+            return "cancelled"
+        if not self.future.done():
+            return "running" if self.future.running() else "pending"
+        error = self.future.exception()
+        if isinstance(error, JobCancelled):
+            return "cancelled"
+        return "error" if error is not None else "done"
+
+    @property
+    def finished(self):
+        return self.future.done()
+
+    def result(self):
+        return self.future.result()
+
+    def error(self):
+        if self.future.cancelled():
+            return None
+        return self.future.exception()
+
+
+def submit_job(name, fn, *args, **kwargs):
+    """
+    Agenda `fn` no pool compartilhado. A função recebe `progress=job.report`.
+    Retorna o Job criado.
+    """
+    job = Job(name)
+    job.future = _executor.submit(fn, *args, progress=job.report, **kwargs)
+    job.future.add_done_callback(job._mark_finished)
+    with _jobs_lock:
+        _evict_finished()
+        _jobs[job.id] = job
+    return job
+
+
+def _evict_finished():
+    """Remove os jobs finalizados há mais de FINISHED_JOB_TTL (chamar com _jobs_lock)."""
+    now = time.monotonic()
+    expired = [
+        job_id
+        for job_id, job in _jobs.items()
+        if job.finished_at is not None and now - job.finished_at > FINISHED_JOB_TTL
+    ]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def get_job(job_id):
+    with _jobs_lock:
+        _evict_finished()
+        return _jobs.get(job_id)
+
+
+def forget_job(job_id):
+    """Remove um job finalizado do registro (após a página consumir o resultado)."""
+    with _jobs_lock:
+        return _jobs.pop(job_id, None)
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+# Índices densos (array) de chave inteira -> posição da linha na dimensão.
+# A busca é um acesso posicional O(1) por linha da fato (index[key - offset]),
+# sem hash nem comparação de strings.
+
+
+def build_lookup_index(keys):
+    """
+    Monta o índice denso para chaves inteiras (surrogate keys ou date_id).
+    Retorna (array de posições com -1 para chaves ausentes, offset da menor chave).
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    if keys.size == 0:
+        return np.empty(0, dtype=np.int64), 0
+
+    offset = int(keys.min())
+    index = np.full(int(keys.max()) - offset + 1, -1, dtype=np.int64)
+    index[keys - offset] = np.arange(keys.size, dtype=np.int64)
+    return index, offset
+
+
+def lookup_positions(lookup, fact_keys):
+    """Converte chaves da fato em posições da dimensão (-1 quando não encontradas)."""
+    index, offset = lookup
+    keys = np.asarray(fact_keys, dtype=np.int64) - offset
+    valid = (keys >= 0) & (keys < index.size)
+    positions = np.full(keys.size, -1, dtype=np.int64)
+    positions[valid] = index[keys[valid]]
+    return positions
+
+
+def take_dimension(dim, key_col, fact_keys, columns=None, lookup=None):
+    """
+    Traz atributos da dimensão para cada linha da fato por acesso posicional.
+    Chaves sem correspondência resultam em nulos (como um left join).
+    """
+    if lookup is None:
+        lookup = build_lookup_index(dim[key_col])
+    columns = columns or [c for c in dim.columns if c != key_col]
+
+    positions = lookup_positions(lookup, fact_keys)
+    if len(dim) == 0:
+        return pd.DataFrame(index=range(positions.size), columns=columns)
+
+    missing = positions < 0
+    taken = dim[columns].iloc[np.where(missing, 0, positions)].reset_index(drop=True)
+    if missing.any():
+        taken.loc[missing] = None
+    return taken
+
+
+# Chave da fato -> (dimensão, coluna de chave na dimensão)
+DIMENSION_KEYS = {
+    "date_id": ("dim_tempo", "date_id"),
+    "location_id": ("dim_localizacao", "location_id"),
+    "customer_key": ("dim_cliente", "customer_key"),
+    "product_key": ("dim_produto", "product_key"),
+    "shipment_key": ("dim_envio", "shipment_key"),
+}
+
+
+def build_lookup_indexes(schema):
+    """Índices densos de todas as dimensões do Star Schema, por chave da fato."""
+    return {
+        fact_key: build_lookup_index(schema[dim_name][dim_key])
+        for fact_key, (dim_name, dim_key) in DIMENSION_KEYS.items()
+        if dim_name in schema and dim_key in schema[dim_name]
+    }
+
+
+def denormalize(schema, attributes, fato=None, lookups=None):
+    """
+    Desnormaliza a fato com os atributos pedidos por chave, ex.:
+    denormalize(schema, {"product_key": ["category"], "location_id": ["market"]})
+    """
+    fato = schema["fato_vendas"] if fato is None else fato
+    lookups = lookups or {}
+
+    parts = [fato.reset_index(drop=True)]
+    for fact_key, columns in attributes.items():
+        dim_name, dim_key = DIMENSION_KEYS[fact_key]
+        parts.append(
+            take_dimension(
+                schema[dim_name],
+                dim_key,
+                fato[fact_key],
+                columns,
+                lookup=lookups.get(fact_key),
+            )
+        )
+    return pd.concat(parts, axis=1)
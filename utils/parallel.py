@@ -0,0 +1,171 @@
+"""
+Limpeza (clean_data) em paralelo, dividindo o DataFrame em blocos de linhas
+entre processos.
+
+A deduplicação é feita antes, no processo principal, sobre o DataFrame inteiro
+(hash de 64 bits por linha), para que duplicatas em blocos diferentes também sejam
+removidas. Os blocos chegam aos processos como buffers Arrow IPC em memória
+compartilhada e os resultados voltam como bytes Arrow IPC, evitando serializar
+as colunas texto objeto a objeto com pickle.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from utils.core import clean_data
+from utils.dedup import drop_duplicate_rows
+
+# Abaixo disso o custo de criar processos e copiar os dados não compensa
+MIN_SHARD_ROWS = 50_000
+
+
+def _ipc_size(table):
+    import pyarrow as pa
+
+    mock = pa.MockOutputStream()
+    with pa.ipc.new_stream(mock, table.schema) as writer:
+        writer.write_table(table)
+    return mock.size()
+
+
+def _to_shared_memory(df):
+    """Grava o bloco como Arrow IPC em um segmento de memória compartilhada."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    size = _ipc_size(table)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+    sink = pa.FixedSizeBufferWriter(pa.py_buffer(shm.buf))
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    sink.close()
+    return shm, size
+
+
+def _to_ipc_bytes(df):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _from_ipc(source, dtypes=None):
+    import pyarrow as pa
+
+    with pa.ipc.open_stream(pa.py_buffer(source)) as reader:
+        df = reader.read_all().to_pandas()
+    # O Arrow não preserva a distinção object/str do pandas: volta aos tipos de origem
+    return df if dtypes is None else df.astype(dtypes)
+
+
+def _clean_shard(shm_name, size, contract, return_quarantine):
+    """Executado no processo filho: limpa um bloco (sem deduplicar de novo)."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        shard = _from_ipc(shm.buf[:size])
+        result = clean_data(
+            shard,
+            return_quarantine=return_quarantine,
+            contract=contract,
+            deduplicate=False,
+        )
+        # O resultado é copiado (take) e não referencia mais a memória compartilhada
+        del shard
+        parts = result if return_quarantine else (result,)
+        return tuple((_to_ipc_bytes(part), part.dtypes.to_dict()) for part in parts)
+    finally:
+        shm.close()
+
+
+def _shard_bounds(rows, shards):
+    edges = np.linspace(0, rows, shards + 1).astype(int)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def clean_data_parallel(
+    df,
+    workers=None,
+    progress=None,
+    return_quarantine=False,
+    contract=None,
+    deduplicator=None,
+):
+    """
+    Equivalente a utils.core.clean_data, executando a padronização, a tipagem e as
+    regras de qualidade em `workers` processos (padrão: número de núcleos).
+    """
+    if df is None:
+        return (None, None) if return_quarantine else None
+
+    # Deduplicação global, antes da divisão em blocos
+    df.columns = df.columns.str.lower()
+    if deduplicator is not None:
+        df = deduplicator.filter(df)
+    else:
+        df = drop_duplicate_rows(df)
+    if progress:
+        progress(stage="deduplicação", rows=len(df))
+
+    workers = workers or os.cpu_count() or 1
+    shards = min(workers, max(1, len(df) // MIN_SHARD_ROWS))
+    if shards == 1:
+        return clean_data(
+            df,
+            progress=progress,
+            return_quarantine=return_quarantine,
+            contract=contract,
+            deduplicate=False,
+        )
+
+    segments = []
+    try:
+        try:
+            for start, stop in _shard_bounds(len(df), shards):
+                segments.append(_to_shared_memory(df.iloc[start:stop]))
+        except (TypeError, ValueError) as e:
+            # Colunas objeto com tipos misturados não têm representação Arrow:
+            # limpa no processo atual
+            if progress:
+                progress(stage="sequencial", rows=len(df), reason=str(e))
+            return clean_data(
+                df,
+                progress=progress,
+                return_quarantine=return_quarantine,
+                contract=contract,
+                deduplicate=False,
+            )
+
+        with ProcessPoolExecutor(max_workers=shards) as pool:
+            futures = [
+                pool.submit(_clean_shard, shm.name, size, contract, return_quarantine)
+                for shm, size in segments
+            ]
+            results = []
+            for idx, future in enumerate(futures, start=1):
+                results.append(
+                    [_from_ipc(data, dtypes) for data, dtypes in future.result()]
+                )
+                if progress:
+                    progress(
+                        stage="blocos",
+                        rows=sum(len(r[0]) for r in results),
+                        chunk=idx,
+                        total_chunks=shards,
+                    )
+    finally:
+        for shm, _ in segments:
+            shm.close()
+            shm.unlink()
+
+    df_clean = pd.concat([r[0] for r in results])
+    if return_quarantine:
+        return df_clean, pd.concat([r[1] for r in results])
+    return df_clean
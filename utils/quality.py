@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+# Regras declarativas: cada regra é um dict com "code" (motivo registrado na
+# quarentena), "check" e "column", além dos parâmetros do tipo de verificação.
+#
+#   {"code": "QTD_MINIMA", "check": "range", "column": "qtd", "min": 10, "inclusive": "neither"}
+#
+# Tipos suportados:
+#   not_null     -> valor presente
+#   numeric      -> valor conversível para número (nulos também falham)
+#   range        -> min/max numéricos; `inclusive` segue Series.between ("both", "neither", "left", "right")
+#   regex        -> valor (como texto) casa inteiramente com `pattern`
+#   referential  -> valor pertence a `values` (lista, Series ou Index da tabela de referência)
+#
+# Nas regras range, regex e referential, valores nulos passam: a ausência de valor
+# é responsabilidade das regras not_null/numeric, evitando motivos duplicados.
+
+QUARANTINE_REASON_COLUMN = "motivo"
+
+
+def _check_not_null(col, rule):
+    return col.notna()
+
+
+def _check_numeric(col, rule):
+    return pd.to_numeric(col, errors="coerce").notna()
+
+
+def _check_range(col, rule):
+    values = pd.to_numeric(col, errors="coerce")
+    lower = rule.get("min", -np.inf)
+    upper = rule.get("max", np.inf)
+    in_range = values.between(lower, upper, inclusive=rule.get("inclusive", "both"))
+    return in_range | values.isna()
+
+
+def _check_regex(col, rule):
+    matches = col.astype(str).str.fullmatch(rule["pattern"])
+    return matches.fillna(False).astype(bool) | col.isna()
+
+
+def _check_referential(col, rule):
+    return col.isin(rule["values"]) | col.isna()
+
+
+CHECKS = {
+    "not_null": _check_not_null,
+    "numeric": _check_numeric,
+    "range": _check_range,
+    "regex": _check_regex,
+    "referential": _check_referential,
+}
+
+
+def rule_masks(df, rules):
+    """Avalia cada regra como uma máscara booleana vetorizada (True = linha válida)."""
+    masks = {}
+    for rule in rules:
+        check = CHECKS.get(rule["check"])
+        if check is None:
+            raise ValueError(f"Tipo de regra desconhecido: {rule['check']}")
+        masks[rule["code"]] = check(df[rule["column"]], rule).to_numpy(dtype=bool)
+    return masks
+
+
+def evaluate_rules(df, rules, return_positions=False):
+    """
+    Aplica as regras de qualidade sobre o DataFrame inteiro.
+    Retorna uma tupla: (linhas válidas, linhas em quarentena com a coluna `motivo`)
+    Com `return_positions=True`, inclui ao final as posições (não os rótulos do
+    índice, que podem se repetir) das linhas em quarentena.
+    O custo é O(linhas x regras), sem laços em Python por linha.
+    """
+    masks = rule_masks(df, rules)
+    if not masks:
+        empty = df.iloc[0:0].assign(**{QUARANTINE_REASON_COLUMN: ""})
+        return (df, empty, np.array([], dtype=np.intp)) if return_positions else (df, empty)
+
+    valid = np.logical_and.reduce(list(masks.values()))
+    failed = ~valid
+
+    # Motivos montados apenas para as linhas reprovadas (códigos separados por ";")
+    reasons = np.full(failed.sum(), "", dtype=object)
+    for code, mask in masks.items():
+        hit = ~mask[failed]
+        reasons[hit] = reasons[hit] + code + ";"
+
+    failed_positions = np.flatnonzero(failed)
+    quarantine = df.take(failed_positions)
+    quarantine[QUARANTINE_REASON_COLUMN] = (
+        pd.Series(reasons, index=quarantine.index, dtype=object).str.rstrip(";")
+    )
+
+    if return_positions:
+        return df.take(np.flatnonzero(valid)), quarantine, failed_positions
+    return df.take(np.flatnonzero(valid)), quarantine
+
+
+def quarantine_counts(quarantine):
+    """Contagem de linhas por código de motivo (uma linha pode ter vários motivos)."""
+    if quarantine is None or quarantine.empty:
+        return pd.Series(dtype="int64", name="linhas")
+    return (
+        quarantine[QUARANTINE_REASON_COLUMN]
+        .str.split(";")
+        .explode()
+        .value_counts()
+        .rename("linhas")
+    )
@@ -0,0 +1,187 @@
+import io
+import os
+
+import pandas as pd
+
+from utils.compression import (
+    compression_of,
+    inner_name,
+    open_decompressed,
+    strip_compression,
+)
+from utils.excel import iter_excel_chunks, read_excel
+from utils.schemas import coerce_to_contract, reader_kwargs
+
+EXCEL_EXTENSIONS = (".xlsx", ".xls")
+CSV_EXTENSIONS = (".csv", ".txt")
+DATA_EXTENSIONS = CSV_EXTENSIONS + EXCEL_EXTENSIONS
+
+
+def read_data(file_or_buffer, contract=None):
+    """
+    Carrega dados de um arquivo CSV ou Excel, sem dependência do Streamlit.
+    Aceita um caminho de arquivo (str) ou um buffer (UploadedFile), comprimidos
+    ou não (.gz, .bz2, .xz, .zst, .zip), descomprimidos em streaming.
+    Com um contrato (utils.schemas), só as colunas do contrato são lidas, já tipadas.
+    Retorna uma tupla: (DataFrame, Mensagem de Erro/Sucesso)
+    """
+    try:
+        if isinstance(file_or_buffer, (str, os.PathLike)):
+            return _load_from_path(os.fspath(file_or_buffer), contract)
+        return _load_from_buffer(file_or_buffer, contract)
+    except Exception as e:
+        return None, str(e)
+
+
+def iter_csv_chunks(source, chunksize, contract=None, filename=None):
+    """
+    Lê um CSV em blocos de `chunksize` linhas (com fallback de encoding).
+    Entradas comprimidas são descomprimidas em streaming, bloco a bloco.
+    Com contrato, um bloco com valor fora do tipo (ex.: texto em coluna numérica)
+    faz o restante do arquivo ser lido como texto e convertido com coerção para
+    nulo, como em read_data.
+    Nos dois fallbacks a leitura é retomada a partir do bloco que falhou, sem
+    repetir as linhas já entregues.
+    """
+    encodings = ["utf-8", "latin-1"]
+    as_text = False
+    rows_read = 0
+    while True:
+        encoding = encodings[0]
+        try:
+            kwargs, mapping = _contract_kwargs(source, contract, encoding, filename)
+            if as_text:
+                kwargs = {"usecols": kwargs["usecols"], "dtype": "str"}
+            if rows_read:
+                kwargs["skiprows"] = range(1, rows_read + 1)
+            with open_decompressed(source, filename, DATA_EXTENSIONS) as stream:
+                reader = pd.read_csv(stream, encoding=encoding, chunksize=chunksize, **kwargs)
+                for chunk in reader:
+                    if as_text:
+                        chunk = coerce_to_contract(chunk, contract)
+                    elif mapping:
+                        chunk = chunk.rename(columns=mapping)
+                    yield chunk
+                    rows_read += len(chunk)
+            return
+        except UnicodeDecodeError:
+            if len(encodings) == 1:
+                raise
+            encodings.pop(0)
+        except (ValueError, TypeError):
+            if contract is None or as_text:
+                raise
+            as_text = True
+
+
+def iter_file_chunks(file_or_buffer, chunksize, contract=None):
+    """Lê um CSV ou Excel (caminho ou buffer, comprimido ou não) em blocos de linhas."""
+    filename = _source_name(file_or_buffer)
+    name = inner_name(file_or_buffer, filename, DATA_EXTENSIONS)
+    if _is_excel(name):
+        return iter_excel_chunks(
+            _excel_source(file_or_buffer, filename),
+            chunksize,
+            contract=contract,
+            filename=name,
+        )
+    return iter_csv_chunks(file_or_buffer, chunksize, contract, filename)
+
+
+def _source_name(file_or_buffer):
+    if isinstance(file_or_buffer, (str, os.PathLike)):
+        return os.fspath(file_or_buffer)
+    return getattr(file_or_buffer, "name", "")
+
+
+def _contract_kwargs(source, contract, encoding, filename=None):
+    """Lê apenas o cabeçalho para montar os argumentos de leitura do contrato."""
+    if contract is None:
+        return {}, None
+
+    with open_decompressed(source, filename, DATA_EXTENSIONS) as stream:
+        header = pd.read_csv(stream, encoding=encoding, nrows=0).columns
+
+    return reader_kwargs(header, contract)
+
+
+def list_input_files(paths, extensions=DATA_EXTENSIONS):
+    """
+    Expande arquivos e diretórios em uma lista ordenada de arquivos suportados
+    (inclusive comprimidos, ex.: .csv.gz, e pacotes .zip).
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if strip_compression(name).lower().endswith(extensions) or (
+                    compression_of(name) == "zip"
+                ):
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+    return files
+
+
+def _load_from_path(file_path, contract=None):
+    if not os.path.exists(file_path):
+        return None, f"Arquivo não encontrado: {file_path}"
+
+    return _load(file_path, file_path, contract)
+
+
+def _load_from_buffer(buffer, contract=None):
+    return _load(buffer, getattr(buffer, "name", ""), contract)
+
+
+def _load(source, filename, contract):
+    name = inner_name(source, filename, DATA_EXTENSIONS)
+    if _is_excel(name):
+        excel = _excel_source(source, filename)
+        return read_excel(excel, contract=contract, filename=name), "Sucesso"
+
+    return _read_csv_with_fallback(source, filename, contract)
+
+
+def _excel_source(source, filename):
+    """
+    Planilhas são arquivos zip e precisam de acesso aleatório: se vierem
+    comprimidas, são descomprimidas para a memória.
+    """
+    if compression_of(filename) is None:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return source
+    with open_decompressed(source, filename, EXCEL_EXTENSIONS) as stream:
+        return io.BytesIO(stream.read())
+
+
+def _is_excel(filename):
+    return filename.lower().endswith(EXCEL_EXTENSIONS)
+
+
+def _read_csv_with_fallback(source, filename, contract=None):
+    try:
+        return _read_csv(source, filename, "utf-8", contract), "Sucesso"
+    except UnicodeDecodeError:
+        return _read_csv(source, filename, "latin-1", contract), "Sucesso"
+
+
+def _read_csv(source, filename, encoding, contract):
+    kwargs, mapping = _contract_kwargs(source, contract, encoding, filename)
+
+    try:
+        with open_decompressed(source, filename, DATA_EXTENSIONS) as stream:
+            df = pd.read_csv(stream, encoding=encoding, **kwargs)
+    except (ValueError, TypeError):
+        if not kwargs:
+            raise
+        # Valor fora do tipo do contrato (ex.: texto em coluna numérica):
+        # lê as colunas do contrato como texto e converte com coerção para nulo
+        with open_decompressed(source, filename, DATA_EXTENSIONS) as stream:
+            df = pd.read_csv(
+                stream, encoding=encoding, usecols=kwargs["usecols"], dtype="str"
+            )
+        return coerce_to_contract(df, contract)
+
+    return df.rename(columns=mapping) if mapping else df
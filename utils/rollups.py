@@ -0,0 +1,100 @@
+import pandas as pd
+
+from utils.lookup import denormalize
+
+# Agregações pré-calculadas (cubos) a partir do Star Schema.
+# Todas as medidas são aditivas (somas e contagem), o que permite a atualização
+# incremental: agrega-se apenas as linhas novas e soma-se ao cubo existente.
+ROLLUPS = {
+    "agg_ano_semana_mercado": ["year", "weeknum", "market"],
+    "agg_categoria": ["category", "sub_category"],
+    "agg_segmento": ["segment"],
+}
+
+MEASURES = ["sales", "profit", "quantity"]
+COUNT_COLUMN = "linhas"
+
+
+def enrich_fact(schema, fato=None):
+    """Fato com os atributos usados nos rollups (ano, semana, mercado, categoria, segmento)."""
+    fato = schema["fato_vendas"] if fato is None else fato
+    return denormalize(
+        schema,
+        {
+            "date_id": ["year", "weeknum"],
+            "location_id": ["market"],
+            "product_key": ["category", "sub_category"],
+            "customer_key": ["segment"],
+        },
+        fato=fato[[*MEASURES, "date_id", "location_id", "product_key", "customer_key"]],
+    )
+
+
+def _aggregate(enriched, dims):
+    grouped = enriched.groupby(dims, dropna=False, observed=True, sort=True)
+    out = grouped[MEASURES].sum()
+    out[COUNT_COLUMN] = grouped.size()
+    return out.reset_index()
+
+
+def build_rollups(schema):
+    """Calcula todos os rollups a partir da fato_vendas completa."""
+    if not schema:
+        return {}
+
+    enriched = enrich_fact(schema)
+    return {name: _aggregate(enriched, dims) for name, dims in ROLLUPS.items()}
+
+
+def update_rollups(rollups, schema):
+    """
+    Atualização incremental: agrega somente a carga nova e soma ao rollup existente.
+    `schema` é o Star Schema da carga nova; as surrogate keys são regeneradas a cada
+    carga, então cada fato é resolvido para os atributos naturais (ano, mercado,
+    categoria...) dentro da própria carga, e são eles a chave do merge.
+    """
+    if not schema:
+        return dict(rollups)
+
+    enriched = enrich_fact(schema)
+
+    updated = {}
+    for name, dims in ROLLUPS.items():
+        delta = _aggregate(enriched, dims)
+        current = rollups.get(name)
+        if current is None or current.empty:
+            updated[name] = delta
+            continue
+
+        combined = pd.concat([current[[*dims, *MEASURES, COUNT_COLUMN]], delta], ignore_index=True)
+        updated[name] = (
+            combined.groupby(dims, dropna=False, observed=True, sort=True)[
+                [*MEASURES, COUNT_COLUMN]
+            ]
+            .sum()
+            .reset_index()
+        )
+    return updated
+
+
+def query_rollup(rollups, name, group_by=None, **filters):
+    """
+    Responde consultas de dashboard a partir do rollup (sem tocar na fato).
+    `filters`: coluna=valor ou coluna=[valores]. `group_by` reagrega em menos
+    dimensões (ex.: vendas por mercado a partir do cubo ano x semana x mercado).
+    """
+    df = rollups[name]
+
+    mask = pd.Series(True, index=df.index)
+    for column, value in filters.items():
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        mask &= df[column].isin(values)
+    df = df[mask]
+
+    if group_by:
+        df = (
+            df.groupby(group_by, dropna=False, observed=True, sort=True)[[*MEASURES, COUNT_COLUMN]]
+            .sum()
+            .reset_index()
+        )
+    return df
@@ -0,0 +1,323 @@
+"""
+Histórico de execuções dos pipelines (ledger em SQLite, data/run_history.db).
+
+Cada execução registra as entradas (impressão digital do conteúdo), os tempos
+por etapa, as contagens de linhas, as saídas e o status. O ledger permite pular
+entradas idênticas já processadas e acompanhar o throughput entre execuções.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from utils.paths import DATA_DIR
+
+RUN_HISTORY_DB = str(DATA_DIR / "run_history.db")
+FINGERPRINT_BLOCK = 1 << 20
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        pipeline TEXT NOT NULL,
+        status TEXT NOT NULL,
+        input_key TEXT NOT NULL,
+        params TEXT,
+        started_at TEXT NOT NULL,
+        finished_at TEXT,
+        duration_s REAL,
+        rows_in INTEGER,
+        rows_out INTEGER,
+        rows_rejected INTEGER,
+        error TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS run_inputs (
+        run_id INTEGER NOT NULL REFERENCES runs(id),
+        source TEXT,
+        size INTEGER,
+        mtime_ns INTEGER,
+        fingerprint TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS run_stages (
+        run_id INTEGER NOT NULL REFERENCES runs(id),
+        seq INTEGER NOT NULL,
+        stage TEXT NOT NULL,
+        duration_s REAL,
+        rows INTEGER
+    )""",
+    """CREATE TABLE IF NOT EXISTS run_outputs (
+        run_id INTEGER NOT NULL REFERENCES runs(id),
+        location TEXT NOT NULL,
+        kind TEXT,
+        mode TEXT,
+        rows INTEGER
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_runs_lookup ON runs (pipeline, input_key, status)",
+    "CREATE INDEX IF NOT EXISTS idx_run_inputs_file ON run_inputs (source, size, mtime_ns)",
+    "CREATE INDEX IF NOT EXISTS idx_run_outputs_location ON run_outputs (location)",
+]
+
+
+def _now():
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+def frame_input(df, source="dataframe"):
+    """Entrada a partir de um DataFrame em memória (hash das linhas e das colunas)."""
+    from utils.dedup import row_fingerprints
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\x1f".join(map(str, df.columns)).encode())
+    digest.update(row_fingerprints(df).tobytes())
+    return {"source": source, "size": len(df), "mtime_ns": None, "fingerprint": digest.hexdigest()}
+
+
+def _input_key(pipeline, inputs, params):
+    raw = json.dumps(
+        [pipeline, [item["fingerprint"] for item in inputs], params or {}],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class RunLedger:
+    """Registro das execuções em SQLite (uma conexão por operação, como em utils.db)."""
+
+    def __init__(self, db_path=RUN_HISTORY_DB):
+        self.db_path = str(db_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._connect() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    @contextmanager
+    def _connect(self):
+        """Conexão por operação: confirma (ou desfaz) e fecha ao sair do bloco."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def file_input(self, path):
+        """
+        Entrada a partir de um arquivo: hash do conteúdo (blake2b, lido em blocos).
+        Se o mesmo caminho, tamanho e mtime já constam no ledger, reaproveita o hash
+        registrado em vez de reler o arquivo.
+        """
+        path = os.path.abspath(os.fspath(path))
+        stat = os.stat(path)
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT fingerprint FROM run_inputs WHERE source = ? AND size = ? AND mtime_ns = ? LIMIT 1",
+                (path, stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+        if row is not None:
+            fingerprint = row[0]
+        else:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(FINGERPRINT_BLOCK), b""):
+                    digest.update(block)
+            fingerprint = digest.hexdigest()
+
+        return {
+            "source": path,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "fingerprint": fingerprint,
+        }
+
+    def find_completed(self, pipeline, inputs, params=None):
+        """
+        Última execução bem-sucedida com as mesmas entradas e parâmetros cujas
+        saídas ainda existem e não foram reescritas por uma execução posterior
+        (acréscimos sucessivos ao mesmo destino não invalidam um ao outro).
+        Retorna um dict com a execução ou None.
+        """
+        key = _input_key(pipeline, inputs, params)
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                """SELECT * FROM runs r
+                   WHERE r.pipeline = ? AND r.input_key = ? AND r.status = 'success'
+                     AND NOT EXISTS (
+                         SELECT 1 FROM run_outputs o
+                         JOIN run_outputs later ON later.location = o.location AND later.run_id > o.run_id
+                         WHERE o.run_id = r.id AND NOT (o.mode = 'append' AND later.mode = 'append')
+                     )
+                   ORDER BY r.id DESC""",
+                (pipeline, key),
+            ).fetchall()
+            for row in rows:
+                outputs = conn.execute(
+                    "SELECT location FROM run_outputs WHERE run_id = ?", (row["id"],)
+                ).fetchall()
+                if all(os.path.exists(out["location"]) for out in outputs):
+                    return dict(row)
+        return None
+
+    def start(self, pipeline, inputs, params=None, targets=()):
+        """
+        Registra o início de uma execução e retorna o Run correspondente.
+        `targets` são os destinos que a execução vai gravar: ficam registrados desde
+        já como saídas, para que uma execução interrompida ou com erro também
+        invalide as anteriores no mesmo destino (find_completed). Ao concluir com
+        sucesso, são substituídos pelas saídas informadas em Run.add_output.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (pipeline, status, input_key, params, started_at) VALUES (?, 'running', ?, ?, ?)",
+                (pipeline, _input_key(pipeline, inputs, params), json.dumps(params or {}, default=str), _now()),
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO run_inputs (run_id, source, size, mtime_ns, fingerprint) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (run_id, item.get("source"), item.get("size"), item.get("mtime_ns"), item["fingerprint"])
+                    for item in inputs
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO run_outputs (run_id, location, mode) VALUES (?, ?, 'replace')",
+                [(run_id, os.path.abspath(os.fspath(target))) for target in targets],
+            )
+        return Run(self, run_id, pipeline)
+
+    def history(self, pipeline=None, limit=50):
+        """Execuções mais recentes, com o throughput (linhas/s) de cada uma."""
+        import pandas as pd
+
+        query = "SELECT id, pipeline, status, started_at, duration_s, rows_in, rows_out, rows_rejected, error FROM runs"
+        params = []
+        if pipeline:
+            # "superstore" inclui as etapas registradas como "superstore.<etapa>"
+            query += " WHERE pipeline = ? OR pipeline LIKE ?"
+            params += [pipeline, f"{pipeline}.%"]
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(int(limit))
+
+        with self._connect() as conn:
+            df = pd.read_sql_query(query, conn, params=params)
+        df["linhas_por_s"] = (df["rows_in"] / df["duration_s"]).round(0)
+        return df
+
+    def stages(self, run_id):
+        """Tempos por etapa de uma execução."""
+        import pandas as pd
+
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                "SELECT stage, duration_s, rows FROM run_stages WHERE run_id = ? ORDER BY seq",
+                conn,
+                params=[int(run_id)],
+            )
+
+
+class Run:
+    """
+    Uma execução em andamento. `progress` segue a convenção dos callbacks do core
+    (cada chamada marca o fim da etapa informada) e acumula os tempos por etapa;
+    `rows` fica com o último valor informado para a etapa.
+    Usado como context manager, registra erro/cancelamento automaticamente.
+    """
+
+    def __init__(self, ledger, run_id, pipeline):
+        self.ledger = ledger
+        self.id = run_id
+        self.pipeline = pipeline
+        self._started = time.perf_counter()
+        self._last_mark = self._started
+        self._stages = {}
+        self._outputs = []
+        self._finished = False
+
+    def progress(self, **info):
+        now = time.perf_counter()
+        stage = info.get("stage")
+        if stage is None:
+            return
+        elapsed, rows = self._stages.get(stage, (0.0, None))
+        self._stages[stage] = (elapsed + now - self._last_mark, info.get("rows", rows))
+        self._last_mark = now
+
+    def chain(self, callback=None):
+        """Callback de progresso que repassa a `callback` (ex.: job.report) e registra a etapa."""
+        if callback is None:
+            return self.progress
+
+        def progress(**info):
+            callback(**info)
+            self.progress(**info)
+
+        return progress
+
+    def stage(self, name, rows=None):
+        """Marca o fim de uma etapa executada fora das funções do core."""
+        self.progress(stage=name, rows=rows)
+
+    def add_output(self, location, kind=None, rows=None, mode="replace"):
+        """Registra uma saída; `mode="append"` indica acréscimo a um destino existente."""
+        self._outputs.append((os.path.abspath(os.fspath(location)), kind, mode, rows))
+
+    def finish(self, rows_in=None, rows_out=None, rows_rejected=None, status="success", error=None):
+        if self._finished:
+            return
+        self._finished = True
+        duration = time.perf_counter() - self._started
+
+        with self.ledger._connect() as conn:
+            conn.execute(
+                """UPDATE runs SET status = ?, finished_at = ?, duration_s = ?, rows_in = ?,
+                       rows_out = ?, rows_rejected = ?, error = ? WHERE id = ?""",
+                (status, _now(), duration, rows_in, rows_out, rows_rejected, error, self.id),
+            )
+            conn.executemany(
+                "INSERT INTO run_stages (run_id, seq, stage, duration_s, rows) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (self.id, seq, stage, elapsed, rows)
+                    for seq, (stage, (elapsed, rows)) in enumerate(self._stages.items())
+                ],
+            )
+            if status == "success":
+                # Os destinos declarados no início dão lugar às saídas efetivas
+                conn.execute("DELETE FROM run_outputs WHERE run_id = ?", (self.id,))
+            conn.executemany(
+                "INSERT INTO run_outputs (run_id, location, kind, mode, rows) VALUES (?, ?, ?, ?, ?)",
+                [(self.id, *output) for output in self._outputs],
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.finish()
+            return False
+        from utils.jobs import JobCancelled
+
+        status = "cancelled" if issubclass(exc_type, JobCancelled) else "error"
+        self.finish(status=status, error=str(exc))
+        return False
+
+
+def run_tracked(
+    ledger, pipeline, inputs, fn, *args, params=None, summarize=None, progress=None, targets=(), **kwargs
+):
+    """
+    Executa `fn(*args, progress=..., **kwargs)` registrando a execução no ledger.
+    `summarize(result, run)` informa contagens e saídas (run.add_output/run.finish);
+    `targets` são os destinos gravados por `fn` (ver RunLedger.start).
+    Compatível com utils.jobs.submit_job, que repassa `progress=job.report`.
+    """
+    with ledger.start(pipeline, inputs, params, targets) as run:
+        result = fn(*args, progress=run.chain(progress), **kwargs)
+        if summarize is not None:
+            summarize(result, run)
+    return result
@@ -0,0 +1,142 @@
+import pandas as pd
+
+from utils.dates import parse_dates
+
+# Contratos de schema: nomes canônicos das colunas, tipos, formato de data e
+# nulabilidade. O leitor usa o contrato para montar `usecols`/`dtype`/`parse_dates`,
+# de forma que a tipagem aconteça durante o parsing e colunas fora do contrato
+# nunca sejam carregadas.
+#
+# dtype: qualquer dtype aceito pelo pandas ("str", "int64", "float64", ...) ou
+#        "datetime" (com "format" opcional, ex.: "%Y-%m-%d").
+# nullable: False gera uma regra not_null para o motor de qualidade (utils.quality).
+
+FOOD_PRODUCTION_CONTRACT = {
+    "name": "producao_alimentos",
+    "columns": {
+        "produto": {"dtype": "str", "nullable": False},
+        "quantidade_produzida_kgs": {"dtype": "float64", "nullable": False},
+        "valor_venda_medio": {"dtype": "float64", "nullable": False},
+        # Texto: os pontos são separadores de milhar e seriam lidos como decimais
+        "receita_total": {"dtype": "str", "nullable": False},
+    },
+}
+
+SUPERSTORE_CONTRACT = {
+    "name": "superstore",
+    "columns": {
+        "row_id": {"dtype": "int64", "nullable": False},
+        "order_id": {"dtype": "str", "nullable": False},
+        "order_date": {"dtype": "datetime", "nullable": False},
+        "ship_date": {"dtype": "datetime", "nullable": False},
+        "ship_mode": {"dtype": "str"},
+        "customer_id": {"dtype": "str", "nullable": False},
+        "customer_name": {"dtype": "str"},
+        "segment": {"dtype": "str"},
+        "city": {"dtype": "str"},
+        "state": {"dtype": "str"},
+        "country": {"dtype": "str"},
+        "region": {"dtype": "str"},
+        "market": {"dtype": "str"},
+        "market2": {"dtype": "str"},
+        "product_id": {"dtype": "str", "nullable": False},
+        "product_name": {"dtype": "str"},
+        "category": {"dtype": "str"},
+        "sub_category": {"dtype": "str"},
+        "order_priority": {"dtype": "str"},
+        "sales": {"dtype": "float64", "nullable": False},
+        "quantity": {"dtype": "float64", "nullable": False},
+        "discount": {"dtype": "float64", "nullable": False},
+        "profit": {"dtype": "float64", "nullable": False},
+        "shipping_cost": {"dtype": "float64", "nullable": False},
+    },
+}
+
+
+def _is_date(spec):
+    return spec["dtype"] == "datetime"
+
+
+def resolve_columns(header, contract):
+    """
+    Mapeia os nomes do arquivo para os nomes canônicos (comparação sem diferenciar
+    maiúsculas/minúsculas e espaços). Retorna {nome_no_arquivo: nome_canônico}.
+    """
+    by_key = {str(col).strip().lower(): col for col in header}
+    mapping = {}
+    missing = []
+    for name in contract["columns"]:
+        raw = by_key.get(name)
+        if raw is None:
+            missing.append(name)
+        else:
+            mapping[raw] = name
+
+    if missing:
+        raise ValueError(
+            f"Colunas ausentes para o contrato '{contract['name']}': {', '.join(missing)}"
+        )
+    return mapping
+
+
+def reader_kwargs(header, contract):
+    """Monta `usecols`, `dtype`, `parse_dates` e `date_format` para o pd.read_csv."""
+    mapping = resolve_columns(header, contract)
+    columns = contract["columns"]
+
+    dtype = {}
+    parse_dates = []
+    date_format = {}
+    for raw, name in mapping.items():
+        spec = columns[name]
+        if _is_date(spec):
+            parse_dates.append(raw)
+            if spec.get("format"):
+                date_format[raw] = spec["format"]
+        else:
+            dtype[raw] = spec["dtype"]
+
+    kwargs = {"usecols": list(mapping), "dtype": dtype, "parse_dates": parse_dates}
+    if date_format:
+        kwargs["date_format"] = date_format
+    return kwargs, mapping
+
+
+def coerce_to_contract(df, contract):
+    """
+    Ajusta um DataFrame já carregado ao contrato em uma única passada por coluna:
+    seleciona e renomeia as colunas e converte apenas as que não estão no tipo certo.
+    Usado para leitores sem suporte a `dtype` (Excel) e como fallback quando a
+    tipagem no parsing falha (ex.: texto em coluna numérica, convertido para nulo).
+    """
+    mapping = resolve_columns(df.columns, contract)
+    df = df[list(mapping)].rename(columns=mapping)
+
+    for name, spec in contract["columns"].items():
+        col = df[name]
+        if _is_date(spec):
+            df[name] = parse_dates(col, spec.get("format"))
+        elif spec["dtype"] == "str":
+            if not pd.api.types.is_string_dtype(col):
+                df[name] = col.astype("str").where(col.notna())
+        elif pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(spec["dtype"])):
+            if col.dtype != spec["dtype"]:
+                values = pd.to_numeric(col, errors="coerce")
+                if values.isna().any() and spec["dtype"].startswith("int"):
+                    # Inteiro com nulos: mantém float para a quarentena tratar
+                    df[name] = values
+                else:
+                    df[name] = values.astype(spec["dtype"])
+        else:
+            df[name] = col.astype(spec["dtype"])
+
+    return df
+
+
+def contract_rules(contract):
+    """Regras not_null (utils.quality) para as colunas não nulas do contrato."""
+    return [
+        {"code": f"{name.upper()}_NULO", "check": "not_null", "column": name}
+        for name, spec in contract["columns"].items()
+        if not spec.get("nullable", True)
+    ]
@@ -0,0 +1,59 @@
+import re
+
+import pandas as pd
+
+
+def extract_multinational_data(wiki_url):
+    """Extrai dados de supermercados multinacionais da Wikipedia."""
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+    try:
+        # Importações tardias: só pagam o custo quando o scraping é executado
+        from urllib.request import urlopen, Request
+        from bs4 import BeautifulSoup
+
+        req = Request(wiki_url, headers=headers)
+        with urlopen(req) as wiki_page:
+            soup = BeautifulSoup(wiki_page, "html.parser")
+
+        tabela = soup.find("table", class_="wikitable")
+        if not tabela:
+            return None, "Tabela não encontrada"
+
+        dados = []
+        linhas = tabela.find_all("tr")
+        cabecalho = [th.text.strip() for th in linhas[0].find_all("th")]
+
+        for linha in linhas[1:]:
+            colunas = linha.find_all(["td", "th"])
+            if len(colunas) > 0:
+                linha_dados = [coluna.text.strip() for coluna in colunas]
+                dados.append(linha_dados)
+
+        df = pd.DataFrame(dados, columns=cabecalho)
+
+        # Limpezas específicas
+        df.columns = df.columns.str.lower()
+        df = df.drop(columns=["map"], errors="ignore")
+
+        rename_map = {
+            "served countries (besides the headquarters)": "countries",
+            "number of locations": "locations",
+            "number of employees": "employees",
+        }
+        df = df.rename(columns=rename_map)
+
+        def extract_number(value):
+            if pd.isna(value) or str(value).strip() == "":
+                return None
+            numbers = re.sub(r"[^\d]", "", str(value))
+            return int(numbers) if numbers else None
+
+        df["locations"] = df["locations"].apply(extract_number)
+        df["employees"] = df["employees"].apply(extract_number)
+
+        return df, "Sucesso"
+
+    except Exception as e:
+        return None, str(e)
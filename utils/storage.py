@@ -0,0 +1,120 @@
+import os
+import shutil
+
+import pandas as pd
+
+from utils.lookup import take_dimension
+
+# Particionamento (hive) da tabela fato: year=2012/market=us/part-0.parquet
+FACT_PARTITIONS = ["year", "market"]
+ROW_GROUP_SIZE = 128_000
+
+
+def _fact_with_partition_columns(schema):
+    """Acrescenta year (de date_id) e market (via dim_localizacao) à tabela fato."""
+    fato = schema["fato_vendas"]
+    markets = take_dimension(
+        schema["dim_localizacao"], "location_id", fato["location_id"], ["market"]
+    )
+
+    return fato.assign(
+        year=(fato["date_id"] // 10000).astype("int32"),
+        market=markets["market"].astype(str).to_numpy(),
+    )
+
+
+def _clear_partitions(root_path):
+    """Remove as partições (year=...) de um dataset, mantendo outros arquivos da pasta."""
+    if not os.path.isdir(root_path):
+        return
+    prefix = f"{FACT_PARTITIONS[0]}="
+    for name in os.listdir(root_path):
+        path = os.path.join(root_path, name)
+        if name.startswith(prefix) and os.path.isdir(path):
+            shutil.rmtree(path)
+
+
+def write_fact_parquet(schema, root_path, row_group_size=ROW_GROUP_SIZE, overwrite=True):
+    """
+    Grava a fato_vendas como dataset Parquet particionado por ano e mercado,
+    com estatísticas por row group (min/max) para filtros com pushdown.
+    Por padrão o dataset é regravado por inteiro: partições de cargas anteriores
+    que não existem em `schema` são apagadas. Com `overwrite=False`, só as
+    partições presentes em `schema` são substituídas.
+    Retorna o número de linhas gravadas.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if overwrite:
+        _clear_partitions(root_path)
+
+    fato = _fact_with_partition_columns(schema)
+    # Ordenar por partição e data deixa as estatísticas de row group mais seletivas
+    fato = fato.sort_values([*FACT_PARTITIONS, "date_id"], kind="stable")
+    table = pa.Table.from_pandas(fato, preserve_index=False)
+
+    file_format = ds.ParquetFileFormat()
+    ds.write_dataset(
+        table,
+        root_path,
+        format=file_format,
+        file_options=file_format.make_write_options(
+            compression="zstd", write_statistics=True
+        ),
+        partitioning=ds.partitioning(
+            table.select(FACT_PARTITIONS).schema, flavor="hive"
+        ),
+        existing_data_behavior="delete_matching",
+        max_rows_per_group=row_group_size,
+        min_rows_per_group=min(row_group_size, 16_384),
+    )
+    return len(fato)
+
+
+def _fact_dataset(root_path):
+    import pyarrow.dataset as ds
+
+    return ds.dataset(root_path, format="parquet", partitioning="hive")
+
+
+def list_fact_partitions(root_path):
+    """Lista os pares (year, market) disponíveis sem ler os dados."""
+    import pyarrow.dataset as ds
+
+    if not os.path.isdir(root_path):
+        return pd.DataFrame(columns=FACT_PARTITIONS)
+
+    dataset = _fact_dataset(root_path)
+    rows = [
+        ds.get_partition_keys(fragment.partition_expression)
+        for fragment in dataset.get_fragments()
+    ]
+    return (
+        pd.DataFrame(rows, columns=FACT_PARTITIONS)
+        .drop_duplicates()
+        .sort_values(FACT_PARTITIONS)
+        .reset_index(drop=True)
+    )
+
+
+def read_fact_parquet(root_path, years=None, markets=None, columns=None, where=None):
+    """
+    Lê apenas as partições/colunas pedidas da fato_vendas.
+    `years`/`markets` podam diretórios; `where` (expressão pyarrow.dataset, ex.:
+    ds.field("sales") > 100) é avaliado com as estatísticas dos row groups.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = _fact_dataset(root_path)
+
+    expression = None
+    if years:
+        expression = ds.field("year").isin([int(y) for y in years])
+    if markets:
+        by_market = ds.field("market").isin([str(m) for m in markets])
+        expression = by_market if expression is None else expression & by_market
+    if where is not None:
+        expression = where if expression is None else expression & where
+
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
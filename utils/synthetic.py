@@ -0,0 +1,480 @@
+"""
+Gerador de dados sintéticos (vetorizado e determinístico pela semente) nos
+layouts brutos do Super Store e da produção de alimentos, com cardinalidades,
+assimetria (Zipf), duplicatas e valores sujos configuráveis.
+
+As tabelas são montadas em blocos de linhas como tabelas Arrow e gravadas com
+os writers do pyarrow (CSV ou Parquet), sem passar por objetos Python por
+linha. Para uma mesma semente e as mesmas opções, o arquivo gerado é sempre
+o mesmo, independente do tamanho do bloco.
+"""
+
+import inspect
+
+import numpy as np
+import pandas as pd
+
+from utils.compression import compression_of
+
+SCHEMAS = ("superstore", "food")
+CHUNK_ROWS = 1_000_000
+
+# Blocos de chaves aleatórias independentes do tamanho do bloco gravado
+_BLOCK = 65_536
+
+FIRST_DAY = "2011-01-01"
+DAYS = 4 * 365
+DATE_FORMAT = "%m/%d/%Y"
+BAD_DATES = np.array(["n/a", "31/31/2014", "00/00/0000", ""], dtype=object)
+
+# país, código, região(ões), market, market2
+GEOGRAPHY = [
+    ("United States", "US", ("East", "West", "Central", "South"), "US", "North America"),
+    ("Canada", "CA", ("Canada",), "Canada", "North America"),
+    ("Mexico", "MX", ("Central America",), "LATAM", "LATAM"),
+    ("Brazil", "BR", ("South America",), "LATAM", "LATAM"),
+    ("France", "FR", ("Central",), "EU", "EU"),
+    ("Germany", "DE", ("Central",), "EU", "EU"),
+    ("United Kingdom", "UK", ("North",), "EU", "EU"),
+    ("Turkey", "TR", ("Western Asia",), "EMEA", "EMEA"),
+    ("Nigeria", "NG", ("Western Africa",), "Africa", "Africa"),
+    ("China", "CN", ("North Asia",), "APAC", "APAC"),
+    ("India", "IN", ("Central Asia",), "APAC", "APAC"),
+    ("Australia", "AU", ("Oceania",), "APAC", "APAC"),
+]
+CATEGORIES = {
+    "Furniture": ("Bookcases", "Chairs", "Furnishings", "Tables"),
+    "Office Supplies": (
+        "Appliances", "Art", "Binders", "Envelopes", "Fasteners",
+        "Labels", "Paper", "Storage", "Supplies",
+    ),
+    "Technology": ("Accessories", "Copiers", "Machines", "Phones"),
+}
+SHIP_MODES = np.array(["Standard Class", "Second Class", "First Class", "Same Day"])
+SHIP_MODE_WEIGHTS = [0.6, 0.2, 0.15, 0.05]
+SHIP_DELAYS = [(4, 8), (2, 6), (1, 4), (0, 1)]
+SEGMENTS = np.array(["Consumer", "Corporate", "Home Office"])
+PRIORITIES = np.array(["Medium", "High", "Critical", "Low"])
+PRIORITY_WEIGHTS = [0.57, 0.31, 0.07, 0.05]
+DISCOUNTS = np.array([0.0, 0.1, 0.2, 0.3, 0.4, 0.5])
+DISCOUNT_WEIGHTS = [0.5, 0.15, 0.2, 0.07, 0.05, 0.03]
+
+FOOD_PRODUCTS = [
+    "arroz", "feijão", "milho", "batata", "tomate", "alface", "cenoura", "abobrinha",
+    "pimentão", "soja", "trigo", "abacaxi", "morango", "melancia", "melão",
+]
+BAD_REVENUES = np.array(["n/d", "12,5", "-", "1.2x"], dtype=object)
+
+
+def _pa():
+    import pyarrow as pa
+
+    return pa
+
+
+def _rng(seed, *key):
+    return np.random.default_rng([seed, *key])
+
+
+def _skewed(rng, n, size, skew):
+    """Índices em [0, n): uniformes (skew=0) ou com cauda Zipf (peso 1/(k+1)^skew)."""
+    if skew <= 0:
+        return rng.integers(0, n, size)
+    cdf = np.cumsum(1.0 / np.arange(1, n + 1) ** skew)
+    return np.minimum(np.searchsorted(cdf, rng.random(size) * cdf[-1]), n - 1)
+
+
+def _codes(prefix, numbers, width):
+    """Identificadores no formato PREFIXO-000123, montados no Arrow."""
+    import pyarrow.compute as pc
+
+    pa = _pa()
+    digits = pc.utf8_lpad(pa.array(numbers).cast(pa.string()), width=width, padding="0")
+    return pc.binary_join_element_wise(prefix, digits, "")
+
+
+def _block_rngs(seed, stream, start, rows):
+    """
+    Geradores por bloco fixo de _BLOCK linhas: o conteúdo de cada linha depende
+    só da semente e da posição, não do tamanho do bloco gravado.
+    """
+    first, last = start // _BLOCK, (start + rows - 1) // _BLOCK
+    for block in range(first, last + 1):
+        lo = max(start, block * _BLOCK)
+        hi = min(start + rows, (block + 1) * _BLOCK)
+        yield _rng(seed, stream, block), lo - block * _BLOCK, hi - lo
+
+
+def _draw(seed, stream, start, rows, fn):
+    """
+    Concatena `fn(rng, _BLOCK)` dos blocos fixos que cobrem [start, start + rows)
+    e recorta o trecho pedido.
+    """
+    parts = []
+    for rng, offset, size in _block_rngs(seed, stream, start, rows):
+        parts.append(fn(rng, _BLOCK)[offset : offset + size])
+    return np.concatenate(parts) if parts else fn(_rng(seed, stream), 0)
+
+
+def _with_duplicates(table, seed, start, rate):
+    """Repete ~`rate` das linhas do bloco (cópias exatas) logo após a original."""
+    if rate <= 0 or table.num_rows == 0:
+        return table
+    repeat = _draw(seed, 99, start, table.num_rows, lambda rng, n: rng.random(n) < rate)
+    index = np.repeat(np.arange(table.num_rows), 1 + repeat)
+    return table.take(index)
+
+
+class _SuperstorePools:
+    """Entidades do Super Store (clientes, produtos, cidades), iguais em todos os blocos."""
+
+    def __init__(self, seed, customers, products, cities):
+        rng = _rng(seed, 0)
+        pa = _pa()
+
+        self.customer_id = _codes("CU-", np.arange(customers), 6)
+        self.customer_name = _codes("Cliente ", np.arange(customers), 6)
+        self.segment = pa.array(SEGMENTS[rng.choice(len(SEGMENTS), customers, p=[0.52, 0.3, 0.18])])
+
+        subcategories = [(cat, sub) for cat, subs in CATEGORIES.items() for sub in subs]
+        kind = rng.integers(0, len(subcategories), products)
+        self.product_id = _codes("PR-", np.arange(products), 6)
+        self.product_name = _codes("Produto ", np.arange(products), 6)
+        self.category = pa.array(np.array([c for c, _ in subcategories])[kind])
+        self.sub_category = pa.array(np.array([s for _, s in subcategories])[kind])
+        self.price = rng.lognormal(3.5, 1.0, products).round(2)
+
+        country = _skewed(rng, len(GEOGRAPHY), cities, 1.0)
+        region_pick = rng.integers(0, 4, cities)
+        regions = np.array(
+            [GEOGRAPHY[c][2][r % len(GEOGRAPHY[c][2])] for c, r in zip(country, region_pick)]
+        ) if cities else np.array([], dtype=str)
+        codes = np.array([g[1] for g in GEOGRAPHY])[country]
+        self.city = _codes("City ", np.arange(cities), 5)
+        self.state = pa.array(
+            np.char.add(np.char.add(codes, "-"), np.char.zfill((np.arange(cities) % 50).astype(str), 2))
+        )
+        self.country = pa.array(np.array([g[0] for g in GEOGRAPHY])[country])
+        self.region = pa.array(regions)
+        self.market = pa.array(np.array([g[3] for g in GEOGRAPHY])[country])
+        self.market2 = pa.array(np.array([g[4] for g in GEOGRAPHY])[country])
+
+        days = pd.date_range(FIRST_DAY, periods=DAYS + 8, freq="D")
+        self.dates = pa.array(days.strftime(DATE_FORMAT))
+
+
+def superstore_table(
+    rows,
+    seed=42,
+    start=0,
+    customers=5_000,
+    products=10_000,
+    cities=500,
+    lines_per_order=3,
+    skew=1.1,
+    duplicate_rate=0.02,
+    bad_date_rate=0.01,
+    null_rate=0.0,
+    pools=None,
+):
+    """
+    Bloco de `rows` linhas no layout bruto do Super Store (a partir da linha `start`).
+    Cada pedido tem `lines_per_order` itens com a mesma data, cliente,
+    cidade e modo de envio; clientes e produtos seguem uma Zipf de expoente `skew`.
+    Sujeira: `duplicate_rate` de cópias exatas, `bad_date_rate` de order_date
+    inválidas e `null_rate` de customer_id/product_id vazios.
+    Retorna uma pyarrow.Table.
+    """
+    pa = _pa()
+    pools = pools or _SuperstorePools(seed, customers, products, cities)
+    n_customers = len(pools.customer_id)
+    n_products = len(pools.product_id)
+    n_cities = len(pools.city)
+
+    # Pedidos: numeração global pela posição da linha
+    order = (start + np.arange(rows)) // lines_per_order
+    first_order = start // lines_per_order
+    n_orders = int(order[-1]) - first_order + 1 if rows else 0
+    local = order - first_order
+
+    def order_attrs(rng, n):
+        return np.column_stack(
+            [
+                _skewed(rng, n_customers, n, skew),
+                rng.integers(0, n_cities, n),
+                rng.integers(0, DAYS, n),
+                rng.choice(len(SHIP_MODES), n, p=SHIP_MODE_WEIGHTS),
+                rng.choice(len(PRIORITIES), n, p=PRIORITY_WEIGHTS),
+                rng.random(n),
+            ]
+        )
+
+    attrs = _draw(seed, 1, first_order, n_orders, order_attrs)[local]
+    customer, city, day, ship_mode, priority = (attrs[:, i].astype(np.int64) for i in range(5))
+    low, high = np.array(SHIP_DELAYS).T
+    ship_day = day + low[ship_mode] + (attrs[:, 5] * (high - low + 1)[ship_mode]).astype(np.int64)
+
+    def line_values(rng, n):
+        return np.column_stack(
+            [
+                _skewed(rng, n_products, n, skew),
+                rng.integers(1, 15, n),
+                rng.choice(len(DISCOUNTS), n, p=DISCOUNT_WEIGHTS),
+                rng.normal(0.15, 0.2, n),
+                rng.gamma(2.0, 0.05, n),
+                rng.random(n),
+                rng.random(n),
+                rng.integers(0, len(BAD_DATES), n),
+            ]
+        )
+
+    line = _draw(seed, 2, start, rows, line_values)
+    product = line[:, 0].astype(np.int64)
+    quantity = line[:, 1].astype(np.int64)
+    discount = DISCOUNTS[line[:, 2].astype(np.int64)]
+    sales = (pools.price[product] * quantity * (1 - discount)).round(2)
+    profit = (sales * (line[:, 3] - discount)).round(2)
+    shipping_cost = (sales * line[:, 4]).round(2)
+
+    order_date = pools.dates.take(day)
+    if bad_date_rate > 0:
+        bad = line[:, 5] < bad_date_rate
+        order_date = _replace(order_date, bad, BAD_DATES[line[:, 7].astype(np.int64)])
+
+    customer_id = pools.customer_id.take(customer)
+    product_id = pools.product_id.take(product)
+    if null_rate > 0:
+        missing = line[:, 6] < null_rate
+        customer_id = _replace(customer_id, missing & (line[:, 7] % 2 == 0), None)
+        product_id = _replace(product_id, missing & (line[:, 7] % 2 == 1), None)
+
+    table = pa.table(
+        {
+            "row_id": np.arange(start + 1, start + rows + 1),
+            "order_id": _codes("CA-", order, 8),
+            "order_date": order_date,
+            "ship_date": pools.dates.take(ship_day),
+            "ship_mode": pa.array(SHIP_MODES[ship_mode]),
+            "customer_id": customer_id,
+            "customer_name": pools.customer_name.take(customer),
+            "segment": pools.segment.take(customer),
+            "city": pools.city.take(city),
+            "state": pools.state.take(city),
+            "country": pools.country.take(city),
+            "region": pools.region.take(city),
+            "market": pools.market.take(city),
+            "market2": pools.market2.take(city),
+            "product_id": product_id,
+            "product_name": pools.product_name.take(product),
+            "category": pools.category.take(product),
+            "sub_category": pools.sub_category.take(product),
+            "order_priority": pa.array(PRIORITIES[priority]),
+            "sales": sales,
+            "quantity": quantity,
+            "discount": discount,
+            "profit": profit,
+            "shipping_cost": shipping_cost,
+        }
+    )
+    return _with_duplicates(table, seed, start, duplicate_rate)
+
+
+def _replace(array, mask, values):
+    """Substitui as posições de `mask` por `values` (escalar, None ou array do mesmo tamanho)."""
+    import pyarrow.compute as pc
+
+    pa = _pa()
+    if values is None:
+        values = pa.nulls(len(array), array.type)
+    elif isinstance(values, np.ndarray):
+        values = pa.array(values, array.type)
+    return pc.if_else(pa.array(mask), values, array)
+
+
+def _dotted(values):
+    """Inteiros com ponto como separador de milhar (25000 -> "25.000"), no Arrow."""
+    import pyarrow.compute as pc
+
+    pa = _pa()
+
+    def group(v, pad):
+        text = pa.array(v).cast(pa.string())
+        return pc.utf8_lpad(text, width=3, padding="0") if pad else text
+
+    millions, thousands, units = values // 1_000_000, values // 1000 % 1000, values % 1000
+    join = pc.binary_join_element_wise
+    return pc.if_else(
+        pa.array(values >= 1_000_000),
+        join(group(millions, False), group(thousands, True), group(units, True), "."),
+        pc.if_else(
+            pa.array(values >= 1000),
+            join(group(values // 1000, False), group(units, True), "."),
+            group(units, False),
+        ),
+    )
+
+
+def food_table(
+    rows,
+    seed=42,
+    start=0,
+    products=len(FOOD_PRODUCTS),
+    skew=1.1,
+    duplicate_rate=0.0,
+    low_quantity_rate=0.2,
+    dotted_rate=0.9,
+    bad_revenue_rate=0.01,
+    pools=None,
+):
+    """
+    Bloco de `rows` linhas no layout de producao_alimentos.csv (a partir da linha `start`).
+    Sujeira: `low_quantity_rate` de quantidades <= 10 kg, `dotted_rate` de receitas com
+    ponto de milhar (as demais sem separador) e `bad_revenue_rate` de receitas fora do
+    formato. Retorna uma pyarrow.Table.
+    """
+    pa = _pa()
+    if pools is None:
+        pools = _food_pools(seed, products)
+    names, base_price = pools
+
+    def values(rng, n):
+        return np.column_stack(
+            [
+                _skewed(rng, len(names), n, skew),
+                rng.lognormal(3.5, 0.8, n),
+                rng.integers(0, 11, n),
+                rng.normal(1.0, 0.15, n),
+                rng.lognormal(0.7, 0.3, n),
+                rng.random(n),
+                rng.random(n),
+                rng.random(n),
+                rng.integers(0, len(BAD_REVENUES), n),
+            ]
+        )
+
+    v = _draw(seed, 3, start, rows, values)
+    product = v[:, 0].astype(np.int64)
+    quantity = np.where(v[:, 5] < low_quantity_rate, v[:, 2], np.maximum(11, v[:, 1].round()))
+    quantity = quantity.astype(np.int64)
+    price = np.maximum(1, (base_price[product] * v[:, 3]).round()).astype(np.int64)
+    revenue = (quantity * price * v[:, 4]).round().astype(np.int64)
+
+    plain = pa.array(revenue).cast(pa.string())
+    receita = _replace(plain, v[:, 6] < dotted_rate, _dotted(revenue))
+    if bad_revenue_rate > 0:
+        bad = v[:, 7] < bad_revenue_rate
+        receita = _replace(receita, bad, BAD_REVENUES[v[:, 8].astype(np.int64)])
+
+    table = pa.table(
+        {
+            "produto": names.take(product),
+            "quantidade_produzida_kgs": quantity,
+            "valor_venda_medio": price,
+            "receita_total": receita,
+        }
+    )
+    return _with_duplicates(table, seed, start, duplicate_rate)
+
+
+def _food_pools(seed, products):
+    rng = _rng(seed, 0)
+    pa = _pa()
+    extra = _codes("produto_", np.arange(len(FOOD_PRODUCTS), max(products, len(FOOD_PRODUCTS))), 5)
+    names = pa.concat_arrays([pa.array(FOOD_PRODUCTS[:products]), extra])
+    return names, rng.integers(5, 30, len(names))
+
+
+def _pools(schema, seed, options):
+    if schema == "superstore":
+        return _SuperstorePools(
+            seed,
+            options.get("customers", 5_000),
+            options.get("products", 10_000),
+            options.get("cities", 500),
+        )
+    return _food_pools(seed, options.get("products", len(FOOD_PRODUCTS)))
+
+
+def _table_function(schema, options):
+    """Função geradora do schema, validando as opções recebidas."""
+    if schema not in SCHEMAS:
+        raise ValueError(f"Schema desconhecido: {schema}. Opções: {', '.join(SCHEMAS)}")
+    make = superstore_table if schema == "superstore" else food_table
+    accepted = set(inspect.signature(make).parameters) - {"rows", "seed", "start", "pools"}
+    unknown = sorted(set(options) - accepted)
+    if unknown:
+        raise ValueError(f"Opções que não se aplicam ao schema {schema}: {', '.join(unknown)}")
+    return make
+
+
+def iter_synthetic(schema, rows, seed=42, chunk_rows=CHUNK_ROWS, **options):
+    """Gera os blocos (pyarrow.Table) de `rows` linhas-base; as duplicatas vêm a mais."""
+    make = _table_function(schema, options)
+    pools = _pools(schema, seed, options)
+    for start in range(0, rows, chunk_rows):
+        yield make(min(chunk_rows, rows - start), seed=seed, start=start, pools=pools, **options)
+
+
+def generate_frame(schema, rows, seed=42, **options):
+    """DataFrame sintético em memória (para testes e benchmarks)."""
+    pa = _pa()
+    tables = list(iter_synthetic(schema, rows, seed=seed, **options))
+    return pa.concat_tables(tables).to_pandas() if tables else pd.DataFrame()
+
+
+_ARROW_COMPRESSIONS = {"gzip": "gzip", "bz2": "bz2", "zstd": "zstd"}
+
+
+def _open_sink(path, codec):
+    """Arquivo de saída; gzip em nível 1 (com o isal, em thread própria), como na leitura."""
+    pa = _pa()
+    if codec == "gzip":
+        try:
+            from isal import igzip_threaded
+
+            return pa.PythonFile(igzip_threaded.open(path, "wb", compresslevel=1, threads=1))
+        except ImportError:
+            import gzip
+
+            return pa.PythonFile(gzip.open(path, "wb", compresslevel=1))
+    sink = pa.OSFile(path, "wb")
+    if codec:
+        sink = pa.CompressedOutputStream(sink, _ARROW_COMPRESSIONS[codec])
+    return sink
+
+
+def write_synthetic(path, schema, rows, seed=42, chunk_rows=CHUNK_ROWS, **options):
+    """
+    Grava o conjunto sintético em `path` (.csv ou .parquet; CSV também em .gz/.bz2/.zst),
+    bloco a bloco. Retorna o número de linhas gravadas (incluindo as duplicatas).
+    """
+    import pyarrow.csv as pv
+    import pyarrow.parquet as pq
+
+    pa = _pa()
+    path = str(path)
+    codec = compression_of(path)
+    is_parquet = path.lower().endswith(".parquet")
+    if codec and codec not in _ARROW_COMPRESSIONS:
+        raise ValueError(f"Compressão não suportada na geração: {codec}")
+    if is_parquet and codec:
+        raise ValueError("Parquet já é comprimido internamente (zstd); use apenas .parquet")
+    _table_function(schema, options)
+
+    written = 0
+    writer = None
+    sink = _open_sink(path, codec)
+    try:
+        for table in iter_synthetic(schema, rows, seed=seed, chunk_rows=chunk_rows, **options):
+            if writer is None:
+                if is_parquet:
+                    writer = pq.ParquetWriter(sink, table.schema, compression="zstd")
+                else:
+                    writer = pv.CSVWriter(sink, table.schema)
+            writer.write_table(table)
+            written += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+        sink.close()
+    return written
@@ -1,5 +1,9 @@
+import time
+
 import streamlit as st
 
+from utils.jobs import get_job, forget_job
+
 
 def setup_sidebar():
     """
@@ -56,3 +60,96 @@ def add_back_to_top():
         """,
         unsafe_allow_html=True,
     )
+
+
+def pagination_controls(total_rows, key, page_sizes=(50, 100, 500)):
+    """
+    Exibe os controles de paginação e retorna (offset, limit) da janela visível.
+    Serve tanto para DataFrames em memória quanto para consultas no banco (LIMIT/OFFSET).
+    """
+    c1, c2, c3 = st.columns([1, 1, 2])
+    page_size = c1.selectbox(
+        "Linhas por página", page_sizes, key=f"{key}_page_size"
+    )
+    total_pages = max(1, -(-total_rows // page_size))
+    page = c2.number_input(
+        "Página",
+        min_value=1,
+        max_value=total_pages,
+        value=1,
+        step=1,
+        key=f"{key}_page",
+    )
+
+    start = (min(int(page), total_pages) - 1) * page_size
+    end = min(start + page_size, total_rows)
+    c3.caption(f"Exibindo linhas {start + 1 if total_rows else 0}–{end} de {total_rows:,}")
+
+    return start, page_size
+
+
+def paginate_dataframe(df, key, page_sizes=(50, 100, 500)):
+    """
+    Exibe os controles de paginação e retorna apenas a janela visível do DataFrame.
+    Estilos e renderização devem ser aplicados ao recorte retornado, nunca à base inteira.
+    """
+    start, page_size = pagination_controls(len(df), key, page_sizes)
+    return df.iloc[start : start + page_size]
+
+
+def _format_progress(progress):
+    parts = []
+    if "stage" in progress:
+        parts.append(f"Etapa: **{progress['stage']}**")
+    if "chunk" in progress:
+        parts.append(f"Bloco {progress['chunk']}/{progress.get('total_chunks', '?')}")
+    if "rows" in progress:
+        total = progress.get("total_rows")
+        rows = f"{progress['rows']:,}" + (f" / {total:,}" if total else "")
+        parts.append(f"Linhas: {rows}")
+    return " · ".join(parts) or "Aguardando início..."
+
+
+def track_job(state_key, label, poll_interval=0.5):
+    """
+    Acompanha um job em segundo plano cujo id está em st.session_state[state_key].
+    Enquanto executa, exibe o progresso em st.status (com botão de cancelamento) e
+    agenda um novo rerun. Retorna o Job finalizado (removido do registro) ou None.
+    """
+    job_id = st.session_state.get(state_key)
+    if job_id is None:
+        return None
+
+    job = get_job(job_id)
+    if job is None:
+        st.session_state[state_key] = None
+        return None
+
+    if not job.finished:
+        with st.status(label, expanded=True):
+            st.write(_format_progress(job.progress))
+            if st.button("⏹️ Cancelar", key=f"{state_key}_cancel"):
+                job.cancel()
+        time.sleep(poll_interval)
+        st.rerun()
+
+    st.session_state[state_key] = None
+    forget_job(job_id)
+    return job
+
+
+def run_history_expander(ledger, pipeline, limit=20):
+    """Histórico de execuções do pipeline (throughput por execução e tempos por etapa)."""
+    with st.expander("📈 Histórico de execuções"):
+        history = ledger.history(pipeline, limit=limit)
+        if history.empty:
+            st.caption("Nenhuma execução registrada.")
+            return
+
+        done = history[history["status"] == "success"].iloc[::-1]
+        if len(done) > 1:
+            st.line_chart(done.set_index("id")["linhas_por_s"])
+        st.dataframe(history, use_container_width=True, hide_index=True)
+
+        run_id = st.selectbox("Etapas da execução", history["id"], key=f"{pipeline}_run_stages")
+        st.dataframe(ledger.stages(run_id), use_container_width=True, hide_index=True)